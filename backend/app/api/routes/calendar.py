@@ -10,6 +10,7 @@ from app.models.calendar import (
     CalendarSourcesResponse,
 )
 from app.services.calendar_service import calendar_service
+from app.utils.google_calendar import normalize_google_calendar_url
 
 router = APIRouter()
 
@@ -110,8 +111,6 @@ async def add_calendar_source(source: CalendarSource):
     """
     # Normalize Google Calendar URLs if needed
     if source.type == "google" and source.ical_url:
-        from app.utils.google_calendar import normalize_google_calendar_url
-
         source.ical_url = normalize_google_calendar_url(source.ical_url)
 
     # Validate Proton Calendar URL format
@@ -1,5 +1,6 @@
 """Configuration endpoints."""
 
+import json
 from typing import Union, List, Dict, Any
 from fastapi import APIRouter
 from pydantic import BaseModel
@@ -160,7 +161,6 @@ async def get_config():
         if schedule_value is not None and schedule_value != "":
             # Parse JSON string if needed (if stored as string - old format)
             # If stored with value_type="json", it's already parsed by _parse_value()
-            import json
             if isinstance(schedule_value, str):
                 try:
                     # Old format: stored as string, need to parse
@@ -274,7 +274,6 @@ async def update_config(config_update: ConfigUpdate):
     if "displaySchedule" in update_dict:
         # Store schedule with explicit type
         # Pass the schedule directly (list/array) to set_value, which will serialize it
-        import json
         schedule = update_dict.pop("displaySchedule")
         if isinstance(schedule, str):
             # If it's already a JSON string, parse it first so we store the actual data structure
@@ -102,8 +102,9 @@ async def get_image_thumbnail(image_id: str):
     if not image:
         raise HTTPException(status_code=404, detail="Image not found")
 
+    # get_thumbnail_path already checks that the file exists
     thumbnail_path = image_service.get_thumbnail_path(image_id)
-    if not thumbnail_path or not thumbnail_path.exists():
+    if not thumbnail_path:
         # Generate thumbnail if it doesn't exist
         image_path = Path(image["path"])
         if not image_path.exists():
@@ -196,33 +197,37 @@ async def upload_image(file: UploadFile = File(...)):
     # Validate file extension
     file_ext = Path(file.filename).suffix.lower()
     if file_ext not in image_service.supported_formats:
+        supported = ", ".join(sorted(image_service.supported_formats))
         raise HTTPException(
             status_code=400,
-            detail=f"Unsupported file format. Supported formats: {', '.join(image_service.supported_formats)}",
+            detail=f"Unsupported file format. Supported formats: {supported}",
         )
 
     # Validate file size (max 10MB)
     max_size = 10 * 1024 * 1024  # 10MB
-    file_content = await file.read()
-    if len(file_content) > max_size:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large. Maximum size is {max_size / (1024 * 1024):.0f}MB",
-        )
+    chunk_size = 1024 * 1024  # Stream uploads to disk 1MB at a time
+
+    # Generate unique filename if file already exists
+    image_path = image_service.image_dir / file.filename
+    counter = 1
+    while image_path.exists():
+        stem = Path(file.filename).stem
+        image_path = image_service.image_dir / f"{stem}_{counter}{file_ext}"
+        counter += 1
 
     # Save file to image directory
     try:
-        # Generate unique filename if file already exists
-        image_path = image_service.image_dir / file.filename
-        counter = 1
-        while image_path.exists():
-            stem = Path(file.filename).stem
-            image_path = image_service.image_dir / f"{stem}_{counter}{file_ext}"
-            counter += 1
-
-        # Write file
+        # Write file in chunks so the upload is never fully buffered in memory
+        written = 0
         with open(image_path, "wb") as f:
-            f.write(file_content)
+            while chunk := await file.read(chunk_size):
+                written += len(chunk)
+                if written > max_size:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"File too large. Maximum size is {max_size / (1024 * 1024):.0f}MB",
+                    )
+                f.write(chunk)
 
         # Generate thumbnail for uploaded image
         image_id = hashlib.md5(str(image_path).encode()).hexdigest()
@@ -247,6 +252,10 @@ async def upload_image(file: UploadFile = File(...)):
             "message": "Image uploaded successfully",
             "image": uploaded_image,
         }
+    except HTTPException:
+        # Clean up partially written file
+        image_path.unlink(missing_ok=True)
+        raise
     except Exception as e:
         # Clean up file if something went wrong
         if image_path.exists():
@@ -274,21 +283,21 @@ async def delete_image(image_id: str):
         raise HTTPException(status_code=404, detail="Image not found")
 
     image_path = Path(image["path"])
-    if image_path.exists():
-        try:
-            # Delete image file
-            image_path.unlink()
-            
-            # Delete thumbnail if it exists
-            thumbnail_path = image_service.get_thumbnail_path(image_id)
-            if thumbnail_path and thumbnail_path.exists():
-                thumbnail_path.unlink()
-            
-            # Force rescan to remove deleted image
-            image_service._last_scan = None
-            image_service.scan_images()
-            return {"message": "Image deleted successfully"}
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to delete image: {str(e)}")
-    else:
+    try:
+        # Delete image file (unlink reports a missing file, no separate exists() probe)
+        image_path.unlink()
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Image file not found")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to delete image: {str(e)}")
+
+    try:
+        # Delete thumbnail if it exists
+        image_service._get_thumbnail_path(image_id).unlink(missing_ok=True)
+
+        # Force rescan to remove deleted image
+        image_service._last_scan = None
+        image_service.scan_images()
+        return {"message": "Image deleted successfully"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to delete image: {str(e)}")
@@ -49,8 +49,7 @@ async def update_keyboard_mappings(mappings: KeyboardMappings):
     Args:
         mappings: Dictionary of keyboard type to key mappings
     """
-    for keyboard_type, type_mappings in mappings.mappings.items():
-        await keyboard_mapping_service.set_mappings(keyboard_type, type_mappings)
+    await keyboard_mapping_service.set_all_mappings(mappings.mappings)
 
     return {"message": "Keyboard mappings updated", "mappings": mappings.mappings}
 
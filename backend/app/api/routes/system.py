@@ -3,6 +3,7 @@
 import asyncio
 import os
 import subprocess
+import time
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException
@@ -48,7 +49,6 @@ async def trigger_update():
             )
         
         # Wait a moment to see if process starts successfully
-        import time
         time.sleep(0.5)
         
         # Check if process is still running (didn't immediately fail)
@@ -133,7 +133,6 @@ async def get_update_status():
         
         # Check if process is still running by checking for recent activity
         # If log was updated in last 60 seconds, assume it's running
-        import time
         log_mtime = log_file.stat().st_mtime
         recently_updated = (time.time() - log_mtime) < 60
         
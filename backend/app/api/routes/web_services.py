@@ -1,7 +1,9 @@
 """Web services API endpoints."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database import get_db
 from app.models.web_service import (
     WebService,
     WebServiceCreate,
@@ -14,23 +16,23 @@ router = APIRouter()
 
 
 @router.get("/web-services", response_model=WebServicesResponse)
-async def get_web_services():
+async def get_web_services(session: AsyncSession = Depends(get_db)):
     """Get all web services."""
-    services = await web_service_service.get_services()
+    services = await web_service_service.get_services(session)
     return WebServicesResponse(services=services, total=len(services))
 
 
 @router.get("/web-services/{service_id}", response_model=WebService)
-async def get_web_service(service_id: str):
+async def get_web_service(service_id: str, session: AsyncSession = Depends(get_db)):
     """Get a web service by ID."""
-    service = await web_service_service.get_service(service_id)
+    service = await web_service_service.get_service(service_id, session)
     if not service:
         raise HTTPException(status_code=404, detail="Web service not found")
     return service
 
 
 @router.post("/web-services", response_model=WebService)
-async def add_web_service(service: WebServiceCreate):
+async def add_web_service(service: WebServiceCreate, session: AsyncSession = Depends(get_db)):
     """
     Add a new web service.
 
@@ -38,22 +40,24 @@ async def add_web_service(service: WebServiceCreate):
     If a service cannot be embedded, you'll see an error message in the viewer.
     You can still open the service in a new window using the provided link.
     """
-    return await web_service_service.add_service(service)
+    return await web_service_service.add_service(service, session)
 
 
 @router.put("/web-services/{service_id}", response_model=WebService)
-async def update_web_service(service_id: str, updates: WebServiceUpdate):
+async def update_web_service(
+    service_id: str, updates: WebServiceUpdate, session: AsyncSession = Depends(get_db)
+):
     """Update a web service."""
-    service = await web_service_service.update_service(service_id, updates)
+    service = await web_service_service.update_service(service_id, updates, session)
     if not service:
         raise HTTPException(status_code=404, detail="Web service not found")
     return service
 
 
 @router.delete("/web-services/{service_id}")
-async def remove_web_service(service_id: str):
+async def remove_web_service(service_id: str, session: AsyncSession = Depends(get_db)):
     """Remove a web service."""
-    removed = await web_service_service.remove_service(service_id)
+    removed = await web_service_service.remove_service(service_id, session)
     if not removed:
         raise HTTPException(status_code=404, detail="Web service not found")
     return {"message": "Web service removed", "service_id": service_id}
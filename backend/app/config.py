@@ -18,6 +18,9 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite:///./data/db/calvin.db"
+    # SQLite serialises writers, so a few pooled connections cover this single-display app
+    db_pool_size: int = 5
+    db_max_overflow: int = 5
 
     # Logging
     log_level: str = "INFO"
@@ -1,17 +1,49 @@
 """Database configuration and session management."""
 
+from collections.abc import AsyncGenerator
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 
 from app.config import settings
 
+_database_url = settings.database_url.replace("sqlite:///", "sqlite+aiosqlite:///")
+
+if ":memory:" in _database_url or "mode=memory" in _database_url:
+    # Every connection to an in-memory database sees its own copy, so share a single one
+    _pool_options = {"poolclass": StaticPool}
+else:
+    # Keep connections open between requests instead of reconnecting to the file each time
+    _pool_options = {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+    }
+
 # Create async engine
 engine = create_async_engine(
-    settings.database_url.replace("sqlite:///", "sqlite+aiosqlite:///"),
+    _database_url,
     echo=settings.debug,
     future=True,
+    **_pool_options,
 )
 
+
+@event.listens_for(engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune each new pooled SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    # Migrations switch the database to WAL; synchronous is per connection, and NORMAL
+    # is only durable enough under WAL, so relax it only there
+    cursor.execute("PRAGMA journal_mode")
+    if cursor.fetchone()[0] == "wal":
+        cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -23,13 +55,10 @@ AsyncSessionLocal = async_sessionmaker(
 Base = declarative_base()
 
 
-async def get_db() -> AsyncSession:
-    """Get database session."""
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get a database session scoped to the current request."""
     async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+        yield session
 
 
 async def init_db():
@@ -1,10 +1,12 @@
 """Main FastAPI application entry point."""
 
+import json
+import logging
 import os
 from pathlib import Path
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
@@ -14,8 +16,14 @@ from app.config import settings
 from app.database import init_db
 from app.services import image_service as image_service_module
 from app.services.calendar_service import calendar_service
+from app.services.config_service import config_service
+from app.services.display_power_service import display_power_service
 from app.services.image_service import ImageService
+from app.services.keyboard_mapping_service import keyboard_mapping_service
 from app.services.scheduler import calendar_scheduler
+from app.utils.migrations import migrate_database
+
+logging.basicConfig(level=settings.log_level.upper())
 
 
 @asynccontextmanager
@@ -27,8 +35,6 @@ async def lifespan(app: FastAPI):
     print("Database initialized")
 
     # Run migrations
-    from app.utils.migrations import migrate_database
-
     await migrate_database()
     print("Database migrations completed")
 
@@ -37,9 +43,6 @@ async def lifespan(app: FastAPI):
     print(f"Loaded {len(calendar_service.sources)} calendar sources from database")
 
     # Initialize default keyboard mappings if none exist
-    from app.services.config_service import config_service
-    from app.services.keyboard_mapping_service import keyboard_mapping_service
-
     # Check if keyboard mappings exist, if not, create defaults
     mappings = await keyboard_mapping_service.get_all_mappings()
     if not mappings:
@@ -55,7 +58,6 @@ async def lifespan(app: FastAPI):
             "KEY_6": "mode_web_services",
             "KEY_7": "mode_spare",
         }
-        await keyboard_mapping_service.set_mappings("7-button", default_7button)
 
         # Set default standard keyboard mappings
         # Layout: 3 generic buttons (next, prev, expand/close) +
@@ -70,7 +72,9 @@ async def lifespan(app: FastAPI):
             "KEY_2": "mode_spare",  # Mode: Spare
             "KEY_S": "mode_settings",  # Settings (separate)
         }
-        await keyboard_mapping_service.set_mappings("standard", default_standard)
+        await keyboard_mapping_service.set_all_mappings(
+            {"7-button": default_7button, "standard": default_standard}
+        )
         print("Initialized default keyboard mappings")
 
     # Initialize image service
@@ -81,100 +85,50 @@ async def lifespan(app: FastAPI):
     image_count = len(image_service_module.image_service.get_images())
     print(f"Image service initialized: {image_count} images found")
 
-    # Initialize default config if not present
-    orientation = await config_service.get_value("orientation")
-    if orientation is None:
-        await config_service.set_value("orientation", "landscape")
-    calendar_split = await config_service.get_value("calendar_split")
-    if calendar_split is None:
-        await config_service.set_value("calendar_split", 70.0)
-    keyboard_type = await config_service.get_value("keyboard_type")
-    if keyboard_type is None:
-        await config_service.set_value("keyboard_type", "7-button")
-    photo_frame_enabled = await config_service.get_value("photo_frame_enabled")
-    if photo_frame_enabled is None:
-        await config_service.set_value("photo_frame_enabled", False)
-    photo_frame_timeout = await config_service.get_value("photo_frame_timeout")
-    if photo_frame_timeout is None:
-        await config_service.set_value("photo_frame_timeout", 300)  # 5 minutes
-    show_ui = await config_service.get_value("show_ui")
-    if show_ui is None:
-        await config_service.set_value("show_ui", True)
-    photo_rotation_interval = await config_service.get_value("photo_rotation_interval")
-    if photo_rotation_interval is None:
-        await config_service.set_value("photo_rotation_interval", 30)  # 30 seconds
-    calendar_view_mode = await config_service.get_value("calendar_view_mode")
-    if calendar_view_mode is None:
-        await config_service.set_value("calendar_view_mode", "month")  # 'month' or 'rolling'
-    time_format = await config_service.get_value("time_format")
-    if time_format is None:
-        await config_service.set_value("time_format", "24h")  # '12h' or '24h' (default: '24h')
-    mode_indicator_timeout = await config_service.get_value("mode_indicator_timeout")
-    if mode_indicator_timeout is None:
-        await config_service.set_value("mode_indicator_timeout", 5)  # 5 seconds default
-    week_start_day = await config_service.get_value("week_start_day")
-    if week_start_day is None:
-        await config_service.set_value("week_start_day", 0)  # Sunday default
-    show_week_numbers = await config_service.get_value("show_week_numbers")
-    if show_week_numbers is None:
-        await config_service.set_value("show_week_numbers", False)  # Hide by default
-    side_view_position = await config_service.get_value("side_view_position")
-    if side_view_position is None:
-        await config_service.set_value("side_view_position", "right")  # Right/bottom default
-    theme_mode = await config_service.get_value("theme_mode")
-    if theme_mode is None:
-        await config_service.set_value("theme_mode", "auto")  # Auto theme by default
-    dark_mode_start = await config_service.get_value("dark_mode_start")
-    if dark_mode_start is None:
-        await config_service.set_value("dark_mode_start", 18)  # 6 PM default
-    dark_mode_end = await config_service.get_value("dark_mode_end")
-    if dark_mode_end is None:
-        await config_service.set_value("dark_mode_end", 6)  # 6 AM default
-    display_schedule_enabled = await config_service.get_value("display_schedule_enabled")
-    if display_schedule_enabled is None:
-        await config_service.set_value("display_schedule_enabled", False)  # Disabled by default
-    display_off_time = await config_service.get_value("display_off_time")
-    if display_off_time is None:
-        await config_service.set_value("display_off_time", "22:00")  # 10 PM default
-    display_on_time = await config_service.get_value("display_on_time")
-    if display_on_time is None:
-        await config_service.set_value("display_on_time", "06:00")  # 6 AM default
-    # Initialize display schedule if not exists (per-day schedule)
-    display_schedule = await config_service.get_value("display_schedule")
-    if display_schedule is None:
-        # Default: all days enabled, 06:00-22:00
-        import json
-        default_schedule = [
-            {"day": i, "enabled": True, "onTime": "06:00", "offTime": "22:00"}
-            for i in range(7)  # 0=Monday, 6=Sunday
-        ]
-        await config_service.set_value("display_schedule", json.dumps(default_schedule))
-    reboot_combo_key1 = await config_service.get_value("reboot_combo_key1")
-    if reboot_combo_key1 is None:
-        await config_service.set_value("reboot_combo_key1", "KEY_1")  # Default first key
-    reboot_combo_key2 = await config_service.get_value("reboot_combo_key2")
-    if reboot_combo_key2 is None:
-        await config_service.set_value("reboot_combo_key2", "KEY_7")  # Default second key
-    reboot_combo_duration = await config_service.get_value("reboot_combo_duration")
-    if reboot_combo_duration is None:
-        await config_service.set_value("reboot_combo_duration", 10000)  # 10 seconds default
-    # Initialize display timeout settings (default: disabled - keep display on)
-    display_timeout_enabled = await config_service.get_value("display_timeout_enabled")
-    if display_timeout_enabled is None:
-        await config_service.set_value("display_timeout_enabled", False)  # Disabled by default - keep display on
-    display_timeout = await config_service.get_value("display_timeout")
-    if display_timeout is None:
-        await config_service.set_value("display_timeout", 0)  # 0 = never (disabled by default - keep display on)
-    image_display_mode = await config_service.get_value("image_display_mode")
-    if image_display_mode is None:
-        await config_service.set_value("image_display_mode", "smart")  # Smart mode by default
+    # Initialize default config if not present (one read + one write transaction)
+    await config_service.set_defaults(
+        {
+            "orientation": "landscape",
+            "calendar_split": 70.0,
+            "keyboard_type": "7-button",
+            "photo_frame_enabled": False,
+            "photo_frame_timeout": 300,  # 5 minutes
+            "show_ui": True,
+            "photo_rotation_interval": 30,  # 30 seconds
+            "calendar_view_mode": "month",  # 'month' or 'rolling'
+            "time_format": "24h",  # '12h' or '24h' (default: '24h')
+            "mode_indicator_timeout": 5,  # 5 seconds default
+            "week_start_day": 0,  # Sunday default
+            "show_week_numbers": False,  # Hide by default
+            "side_view_position": "right",  # Right/bottom default
+            "theme_mode": "auto",  # Auto theme by default
+            "dark_mode_start": 18,  # 6 PM default
+            "dark_mode_end": 6,  # 6 AM default
+            "display_schedule_enabled": False,  # Disabled by default
+            "display_off_time": "22:00",  # 10 PM default
+            "display_on_time": "06:00",  # 6 AM default
+            # Per-day display schedule. Default: all days enabled, 06:00-22:00
+            "display_schedule": json.dumps(
+                [
+                    {"day": i, "enabled": True, "onTime": "06:00", "offTime": "22:00"}
+                    for i in range(7)  # 0=Monday, 6=Sunday
+                ]
+            ),
+            "reboot_combo_key1": "KEY_1",  # Default first key
+            "reboot_combo_key2": "KEY_7",  # Default second key
+            "reboot_combo_duration": 10000,  # 10 seconds default
+            # Display timeout settings (default: disabled - keep display on)
+            "display_timeout_enabled": False,
+            "display_timeout": 0,  # 0 = never
+            "image_display_mode": "smart",  # Smart mode by default
+        }
+    )
 
     # Start schedulers
     calendar_scheduler.start()
     print("Calendar scheduler started - refreshing every 15 minutes")
     
     # Start display power scheduler
-    from app.services.display_power_service import display_power_service
     await display_power_service.start()
     print("Display power scheduler started")
     
@@ -247,7 +201,6 @@ if frontend_dist.exists():
             full_path.startswith("openapi.json") or
             full_path.startswith("assets/")):
             # Return 404 for API routes that don't exist (let routers handle it)
-            from fastapi import HTTPException
             raise HTTPException(status_code=404, detail="Not found")
         
         index_path = frontend_dist / "index.html"
@@ -1,6 +1,6 @@
 """Database models for calendar sources and configuration."""
 
-from sqlalchemy import Boolean, Column, Integer, String, Text
+from sqlalchemy import Boolean, Column, Index, Integer, String, Text
 
 from app.database import Base
 
@@ -40,7 +40,11 @@ class KeyboardMappingDB(Base):
     key_code = Column(String, nullable=False)  # e.g., 'KEY_1', 'KEY_RIGHT'
     action = Column(String, nullable=False)  # e.g., 'calendar_next_month'
 
-    __table_args__ = ({"sqlite_autoincrement": True},)
+    # Mappings are always read, replaced or updated by keyboard type (and key code)
+    __table_args__ = (
+        Index("idx_keyboard_mappings_type", "keyboard_type", "key_code"),
+        {"sqlite_autoincrement": True},
+    )
 
 
 class WebServiceDB(Base):
@@ -54,3 +58,6 @@ class WebServiceDB(Base):
     enabled = Column(Boolean, default=True, nullable=False)
     display_order = Column(Integer, default=0, nullable=False)  # Order for display/switching
     fullscreen = Column(Boolean, default=False, nullable=False)  # Prefer fullscreen mode
+
+    # Matches the ORDER BY used when listing services, so SQLite can skip the sort
+    __table_args__ = (Index("idx_web_services_order", "display_order", "name"),)
@@ -1,11 +1,14 @@
 """Web service data models."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class WebService(BaseModel):
     """Web service model."""
 
+    # Allow building directly from WebServiceDB rows
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     name: str
     url: str
@@ -1,5 +1,10 @@
 """Calendar service for fetching events from external sources."""
 
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
 from datetime import UTC, datetime, timedelta
 
 from sqlalchemy import select
@@ -10,20 +15,253 @@ from app.models.db_models import CalendarSourceDB
 from app.utils.google_calendar import normalize_google_calendar_url
 from app.utils.ical_parser import parse_ical_from_url
 
+logger = logging.getLogger(__name__)
+
+# Event cache key: (source ID, range start, range end)
+CacheKey = tuple[str, datetime, datetime]
+
 
 class CalendarService:
     """Service for managing calendar events."""
 
     def __init__(self):
         """Initialize calendar service."""
-        self.sources: list[CalendarSource] = []
-        self._cache: dict = {}
-        self._cache_ttl = timedelta(minutes=5)  # Cache for 5 minutes (reduced for better freshness)
+        # Sources keyed by ID for O(1) lookup; dicts keep insertion order for display
+        self._sources_by_id: dict[str, CalendarSource] = {}
+        # (source_id, start, end) -> (expires_at, events); tuples are smaller and cheaper
+        # than nested dicts. Ordered least to most recently used for LRU eviction.
+        self._cache: OrderedDict[CacheKey, tuple[float, list[CalendarEvent]]] = OrderedDict()
+        self._cache_ttl_seconds = 5 * 60.0  # Cache for 5 minutes (reduced for better freshness)
+        self._cache_max_entries = 512  # Bound memory: one entry per (source, date range)
+        self._inflight: dict[str, asyncio.Task] = {}  # Feed fetches in progress, keyed by URL
+
+    @property
+    def sources(self) -> list[CalendarSource]:
+        """Calendar sources, in the order they were loaded or added."""
+        return list(self._sources_by_id.values())
+
+    @sources.setter
+    def sources(self, sources: list[CalendarSource]):
+        self._sources_by_id = {source.id: source for source in sources}
+
+    @property
+    def cache_ttl_seconds(self) -> float:
+        """How long fetched events are served from the cache, in seconds."""
+        return self._cache_ttl_seconds
 
     def clear_cache(self):
         """Clear the event cache."""
         self._cache.clear()
-        print("Calendar event cache cleared")
+        logger.debug("Calendar event cache cleared")
+
+    async def sweep_cache(self) -> int:
+        """
+        Drop expired entries from the event cache.
+
+        Lookups never delete, so entries for date ranges nobody asks for again
+        are removed here, from a periodic scheduler job. It is a coroutine so
+        the scheduler runs it on the event loop that owns the cache; a sync job
+        would run in a worker thread and race with lookups.
+
+        Returns:
+            Number of entries removed
+        """
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._cache.items() if now >= expires_at]
+        for key in expired:
+            self._cache.pop(key, None)
+        return len(expired)
+
+    def _cache_events(self, cache_key: CacheKey, events: list[CalendarEvent]):
+        """
+        Store events in the cache, evicting least recently used entries beyond the size limit.
+
+        Args:
+            cache_key: Cache key (source ID and date range)
+            events: Events to cache
+        """
+        # Monotonic clock: cheap to read and immune to wall-clock/NTP jumps
+        self._cache[cache_key] = (time.monotonic() + self._cache_ttl_seconds, events)
+        self._cache.move_to_end(cache_key)
+        while len(self._cache) > self._cache_max_entries:
+            self._cache.popitem(last=False)
+
+    async def _fetch_ical_events(self, ical_url: str) -> list[CalendarEvent]:
+        """
+        Fetch events from an iCal URL, sharing one request between concurrent callers.
+
+        Args:
+            ical_url: iCal feed URL
+
+        Returns:
+            List of calendar events parsed from the feed
+        """
+        task = self._inflight.get(ical_url)
+        if task is None:
+            task = asyncio.ensure_future(parse_ical_from_url(ical_url))
+            self._inflight[ical_url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(ical_url, None))
+        # Shield so a cancelled caller doesn't cancel the fetch for everyone else
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def _source_feed_url(source: CalendarSource) -> str | None:
+        """
+        Get the iCal feed URL for a calendar source.
+
+        Args:
+            source: Calendar source
+
+        Returns:
+            Feed URL, or None if the source type has no iCal feed
+        """
+        if not source.ical_url:
+            return None
+        if source.type == "google":
+            # Normalize URL (convert share URL to iCal if needed)
+            return normalize_google_calendar_url(source.ical_url)
+        if source.type == "proton":
+            # Proton Calendar uses direct iCal URLs with authentication parameters
+            # URL format: https://calendar.proton.me/api/calendar/v1/url/{calendar_id}/calendar.ics?CacheKey=...&PassphraseKey=...
+            return source.ical_url
+        return None
+
+    @staticmethod
+    def _filter_source_events(
+        source: CalendarSource,
+        feed_events: list[CalendarEvent],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[CalendarEvent]:
+        """
+        Select feed events overlapping a date range and tag them with their source.
+
+        Args:
+            source: Calendar source the feed belongs to
+            feed_events: All events parsed from the source's feed
+            start_date: Start of the date range
+            end_date: End of the date range
+
+        Returns:
+            Events in range, with the source ID and color applied
+        """
+        filtered_events = []
+        for e in feed_events:
+            # Events can span across the date range, so check for overlap:
+            # event starts before range ends AND event ends after range starts
+            if e.start <= end_date and e.end >= start_date:
+                # Create a new event with the correct source ID
+                updated_event = e.model_copy(update={"source": source.id})
+                # Apply calendar source color if not already set
+                if source.color and not updated_event.color:
+                    updated_event.color = source.color
+                filtered_events.append(updated_event)
+        return filtered_events
+
+    async def _get_source_events(
+        self,
+        source: CalendarSource,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[CalendarEvent]:
+        """
+        Get events for one source, from the cache or its iCal feed.
+
+        Args:
+            source: Calendar source
+            start_date: Start of the date range (timezone-aware)
+            end_date: End of the date range (timezone-aware)
+
+        Returns:
+            Events in range; stale cached events if the fetch fails
+        """
+        # Check cache first
+        cache_key = (source.id, start_date, end_date)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            expires_at, cached_events = cached
+            if time.monotonic() < expires_at:
+                self._cache.move_to_end(cache_key)
+                return cached_events
+
+        ical_url = None
+        try:
+            # Inside the try so one malformed source URL can't fail the whole request
+            ical_url = self._source_feed_url(source)
+            if ical_url is None:
+                return []
+
+            logger.debug(
+                "Fetching events from %s (%s) using URL: %.80s...",
+                source.name,
+                source.type,
+                ical_url,
+            )
+            feed_events = await self._fetch_ical_events(ical_url)
+            filtered_events = self._filter_source_events(source, feed_events, start_date, end_date)
+            logger.debug(
+                "Successfully fetched %d events from %s", len(filtered_events), source.name
+            )
+            self._cache_events(cache_key, filtered_events)
+            return filtered_events
+        except Exception as e:
+            logger.warning(
+                "Error fetching events from %s (%s, URL: %.80s...): %s",
+                source.name,
+                source.type,
+                ical_url,
+                e,
+                exc_info=True,
+            )
+            # Try to use cached data if available
+            if cached is not None:
+                logger.info("Using cached data for %s", source.name)
+                return cached[1]
+            return []
+
+    async def refresh_cache(self) -> int:
+        """
+        Re-fetch every cached date range so the next request is served warm.
+
+        Each enabled source's feed is downloaded once, all sources in parallel,
+        and re-filtered for every date range currently cached for it. Ranges
+        whose source fails to fetch keep their existing entry.
+
+        Returns:
+            Number of cache entries refreshed
+        """
+        ranges: dict[str, list[tuple[datetime, datetime]]] = {}
+        for source_id, start_date, end_date in self._cache:
+            ranges.setdefault(source_id, []).append((start_date, end_date))
+
+        feeds: dict[str, str] = {}
+        sources = []
+        for source in map(self._sources_by_id.get, ranges):
+            if source and source.enabled:
+                ical_url = self._source_feed_url(source)
+                if ical_url:
+                    feeds[source.id] = ical_url
+                    sources.append(source)
+        results = await asyncio.gather(
+            *(self._fetch_ical_events(feeds[source.id]) for source in sources),
+            return_exceptions=True,
+        )
+
+        refreshed = 0
+        for source, feed_events in zip(sources, results, strict=True):
+            if isinstance(feed_events, Exception):
+                logger.warning("Error refreshing events from %s: %s", source.name, feed_events)
+                continue
+            for start_date, end_date in ranges[source.id]:
+                cache_key = (source.id, start_date, end_date)
+                events = self._filter_source_events(source, feed_events, start_date, end_date)
+                if cache_key in self._cache:
+                    # A background refresh isn't a read, so keep the entry's LRU position
+                    self._cache[cache_key] = (time.monotonic() + self._cache_ttl_seconds, events)
+                else:
+                    self._cache_events(cache_key, events)
+                refreshed += 1
+        return refreshed
 
     async def get_events(
         self,
@@ -51,179 +289,42 @@ class CalendarService:
             end_date = end_date.replace(tzinfo=UTC)
 
         # Filter sources if specified
-        sources = self.sources
+        sources = self._sources_by_id.values()
         if source_ids:
-            sources = [s for s in self.sources if s.id in source_ids]
-
-        # Fetch events from enabled sources
-        for source in sources:
-            if not source.enabled:
-                continue
-
-            if source.type == "google" and source.ical_url:
-                # Normalize URL (convert share URL to iCal if needed)
-                ical_url = normalize_google_calendar_url(source.ical_url)
-
-                # Check cache first
-                cache_key = f"{source.id}:{start_date.isoformat()}:{end_date.isoformat()}"
-                if cache_key in self._cache:
-                    cached_data = self._cache[cache_key]
-                    if datetime.now() - cached_data["timestamp"] < self._cache_ttl:
-                        # Ensure cached events have the correct source ID
-                        cached_events = cached_data["events"]
-                        updated_cached_events = []
-                        for e in cached_events:
-                            # Update source ID if needed
-                            if e.source != source.id:
-                                updated_event = e.model_copy(update={"source": source.id})
-                                updated_cached_events.append(updated_event)
-                            else:
-                                updated_cached_events.append(e)
-                        events.extend(updated_cached_events)
-                        continue
-
-                    # Fetch from Google Calendar iCal URL (public or private)
-                try:
-                    print(f"Fetching events from {source.name} using URL: {ical_url[:80]}...")
-                    ical_events = await parse_ical_from_url(ical_url)
-                    # Filter events by date range and apply calendar source color and ID
-                    # Note: Events can span across the date range,
-                    # so check if event overlaps with range
-                    filtered_events = []
-                    for e in ical_events:
-                        # Event overlaps if: event starts before range ends AND
-                        # event ends after range starts
-                        if e.start <= end_date and e.end >= start_date:
-                            # Create a new event with the correct source ID
-                            # Use model_copy to create a new instance with updated source
-                            updated_event = e.model_copy(update={"source": source.id})
-                            # Apply calendar source color if not already set
-                            if source.color and not updated_event.color:
-                                updated_event.color = source.color
-                            filtered_events.append(updated_event)
-                    events.extend(filtered_events)
-                    print(f"Successfully fetched {len(filtered_events)} events from {source.name}")
-
-                    # Cache the results
-                    self._cache[cache_key] = {
-                        "events": filtered_events,
-                        "timestamp": datetime.now(),
-                    }
-                except Exception as e:
-                    print(f"Error fetching events from {source.name}: {e}")
-                    print(f"URL used: {ical_url}")
-                    import traceback
-
-                    traceback.print_exc()
-                    # Try to use cached data if available
-                    if cache_key in self._cache:
-                        print(f"Using cached data for {source.name}")
-                        cached_events = self._cache[cache_key]["events"]
-                        # Ensure cached events have the correct source ID
-                        updated_cached_events = []
-                        for e in cached_events:
-                            if e.source != source.id:
-                                updated_event = e.model_copy(update={"source": source.id})
-                                updated_cached_events.append(updated_event)
-                            else:
-                                updated_cached_events.append(e)
-                        events.extend(updated_cached_events)
-            elif source.type == "proton" and source.ical_url:
-                # Proton Calendar uses direct iCal URLs with authentication parameters
-                # URL format: https://calendar.proton.me/api/calendar/v1/url/{calendar_id}/calendar.ics?CacheKey=...&PassphraseKey=...
-                ical_url = source.ical_url
-
-                # Check cache first
-                cache_key = f"{source.id}:{start_date.isoformat()}:{end_date.isoformat()}"
-                if cache_key in self._cache:
-                    cached_data = self._cache[cache_key]
-                    if datetime.now() - cached_data["timestamp"] < self._cache_ttl:
-                        # Ensure cached events have the correct source ID
-                        cached_events = cached_data["events"]
-                        updated_cached_events = []
-                        for e in cached_events:
-                            # Update source ID if needed
-                            if e.source != source.id:
-                                updated_event = e.model_copy(update={"source": source.id})
-                                updated_cached_events.append(updated_event)
-                            else:
-                                updated_cached_events.append(e)
-                        events.extend(updated_cached_events)
-                        continue
-
-                # Fetch from Proton Calendar iCal URL
-                try:
-                    url_preview = ical_url[:80]
-                    print(
-                        f"Fetching events from {source.name} (Proton Calendar) "
-                        f"using URL: {url_preview}..."
-                    )
-                    ical_events = await parse_ical_from_url(ical_url)
-                    # Filter events by date range and apply calendar source color and ID
-                    filtered_events = []
-                    for e in ical_events:
-                        # Event overlaps if: event starts before range ends AND
-                        # event ends after range starts
-                        if e.start <= end_date and e.end >= start_date:
-                            # Create a new event with the correct source ID
-                            updated_event = e.model_copy(update={"source": source.id})
-                            # Apply calendar source color if not already set
-                            if source.color and not updated_event.color:
-                                updated_event.color = source.color
-                            filtered_events.append(updated_event)
-                    events.extend(filtered_events)
-                    event_count = len(filtered_events)
-                    print(
-                        f"Successfully fetched {event_count} events from "
-                        f"{source.name} (Proton Calendar)"
-                    )
-
-                    # Cache the results
-                    self._cache[cache_key] = {
-                        "events": filtered_events,
-                        "timestamp": datetime.now(),
-                    }
-                except Exception as e:
-                    print(f"Error fetching events from {source.name} (Proton Calendar): {e}")
-                    print(f"URL used: {ical_url[:100]}...")
-                    import traceback
-
-                    traceback.print_exc()
-                    # Try to use cached data if available
-                    if cache_key in self._cache:
-                        print(f"Using cached data for {source.name} (Proton Calendar)")
-                        cached_events = self._cache[cache_key]["events"]
-                        # Ensure cached events have the correct source ID
-                        updated_cached_events = []
-                        for e in cached_events:
-                            if e.source != source.id:
-                                updated_event = e.model_copy(update={"source": source.id})
-                                updated_cached_events.append(updated_event)
-                            else:
-                                updated_cached_events.append(e)
-                        events.extend(updated_cached_events)
+            sources = [s for s in sources if s.id in source_ids]
+
+        # Fetch events from enabled sources concurrently; gather keeps source order
+        results = await asyncio.gather(
+            *(
+                self._get_source_events(source, start_date, end_date)
+                for source in sources
+                if source.enabled
+            )
+        )
+        for source_events in results:
+            events.extend(source_events)
 
         # Only add mock events if no real calendar sources are configured or no real events found
         # This helps with initial testing but will be skipped once real calendars are added
-        has_enabled_sources = any(source.enabled for source in self.sources)
+        has_enabled_sources = any(source.enabled for source in self._sources_by_id.values())
         has_real_events = len(events) > 0
 
         if not has_enabled_sources or not has_real_events:
             mock_events = self._get_mock_events(start_date, end_date)
             events.extend(mock_events)
             if not has_enabled_sources:
-                print(f"Added {len(mock_events)} mock events (no calendar sources configured)")
+                logger.debug(
+                    "Added %d mock events (no calendar sources configured)", len(mock_events)
+                )
             else:
-                mock_count = len(mock_events)
-                print(
-                    f"Added {mock_count} mock events "
-                    "(no real events found from configured calendars)"
+                logger.debug(
+                    "Added %d mock events (no real events found from configured calendars)",
+                    len(mock_events),
                 )
         else:
-            event_count = len(events)
-            print(
-                f"Returning {event_count} real events from configured calendars "
-                "(mock events skipped)"
+            logger.debug(
+                "Returning %d real events from configured calendars (mock events skipped)",
+                len(events),
             )
 
         return events
@@ -243,9 +344,6 @@ class CalendarService:
         Returns:
             List of mock calendar events
         """
-        import random
-        from datetime import timedelta
-
         mock_events: list[CalendarEvent] = []
         colors = ["#2196f3", "#4caf50", "#ff9800", "#f44336", "#9c27b0", "#00bcd4"]
 
@@ -354,7 +452,7 @@ class CalendarService:
                 )
                 for db_source in db_sources
             ]
-            print(f"Loaded {len(self.sources)} calendar sources from database")
+            logger.info("Loaded %d calendar sources from database", len(self._sources_by_id))
 
     async def get_sources(self) -> list[CalendarSource]:
         """
@@ -391,8 +489,8 @@ class CalendarService:
             await session.commit()
             await session.refresh(db_source)
 
-        # Add to in-memory list
-        self.sources.append(source)
+        # Add to in-memory sources
+        self._sources_by_id[source.id] = source
         return source
 
     async def remove_source(self, source_id: str) -> bool:
@@ -407,18 +505,13 @@ class CalendarService:
         """
         # Remove from database
         async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(CalendarSourceDB).where(CalendarSourceDB.id == source_id)
-            )
-            db_source = result.scalar_one_or_none()
+            db_source = await session.get(CalendarSourceDB, source_id)
             if db_source:
                 await session.delete(db_source)
                 await session.commit()
 
-        # Remove from in-memory list
-        initial_count = len(self.sources)
-        self.sources = [s for s in self.sources if s.id != source_id]
-        return len(self.sources) < initial_count
+        # Remove from in-memory sources
+        return self._sources_by_id.pop(source_id, None) is not None
 
     async def update_source(self, source_id: str, source: CalendarSource) -> CalendarSource | None:
         """
@@ -433,10 +526,7 @@ class CalendarService:
         """
         # Update in database
         async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(CalendarSourceDB).where(CalendarSourceDB.id == source_id)
-            )
-            db_source = result.scalar_one_or_none()
+            db_source = await session.get(CalendarSourceDB, source_id)
             if db_source:
                 db_source.type = source.type
                 db_source.name = source.name
@@ -450,12 +540,11 @@ class CalendarService:
             else:
                 return None
 
-        # Update in-memory list
-        for i, s in enumerate(self.sources):
-            if s.id == source_id:
-                self.sources[i] = source
-                return source
-        return None
+        # Update in-memory sources; replacing an existing key keeps its position
+        if source_id not in self._sources_by_id:
+            return None
+        self._sources_by_id[source_id] = source
+        return source
 
 
 # Global calendar service instance
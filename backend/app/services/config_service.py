@@ -14,7 +14,10 @@ class ConfigService:
 
     def __init__(self):
         """Initialize config service."""
-        self._cache: dict[str, Any] = {}
+        # Parsed configuration, loaded on first read and kept in sync by set_value
+        self._cache: dict[str, Any] | None = None
+        # Bumped on every write, so a load that overlapped one doesn't cache its old result
+        self._cache_generation = 0
 
     async def get_config(self) -> dict[str, Any]:
         """
@@ -23,15 +26,23 @@ class ConfigService:
         Returns:
             Dictionary of configuration key-value pairs
         """
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(select(ConfigDB))
-            config_items = result.scalars().all()
+        if self._cache is None:
+            generation = self._cache_generation
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(select(ConfigDB))
+                config_items = result.scalars().all()
+
+                config = {}
+                for item in config_items:
+                    config[item.key] = self._parse_value(item.value, item.value_type)
 
-            config = {}
-            for item in config_items:
-                config[item.key] = self._parse_value(item.value, item.value_type)
+            if generation != self._cache_generation:
+                # A write committed while this load was in flight; don't cache what may be stale
+                return config
+            self._cache = config
 
-            return config
+        # Return a copy so callers can add derived keys without touching the cache
+        return dict(self._cache)
 
     async def get_value(self, key: str, default: Any = None) -> Any:
         """
@@ -44,9 +55,12 @@ class ConfigService:
         Returns:
             Configuration value or default
         """
+        if self._cache is not None:
+            return self._cache.get(key, default)
+
         async with AsyncSessionLocal() as session:
-            result = await session.execute(select(ConfigDB).where(ConfigDB.key == key))
-            item = result.scalar_one_or_none()
+            # Primary key lookup
+            item = await session.get(ConfigDB, key)
 
             if item:
                 return self._parse_value(item.value, item.value_type)
@@ -67,8 +81,7 @@ class ConfigService:
         serialized_value = self._serialize_value(value, value_type)
 
         async with AsyncSessionLocal() as session:
-            result = await session.execute(select(ConfigDB).where(ConfigDB.key == key))
-            item = result.scalar_one_or_none()
+            item = await session.get(ConfigDB, key)
 
             if item:
                 item.value = serialized_value
@@ -78,9 +91,11 @@ class ConfigService:
                 session.add(item)
 
             await session.commit()
+            self._cache_generation += 1
 
-            # Update cache
-            self._cache[key] = value
+            # Update cache with the value as it will be read back from the database
+            if self._cache is not None:
+                self._cache[key] = self._parse_value(serialized_value, value_type)
 
     async def update_config(self, config: dict[str, Any]) -> None:
         """
@@ -89,8 +104,76 @@ class ConfigService:
         Args:
             config: Dictionary of key-value pairs to update
         """
+        if not config:
+            return
+
+        serialized: dict[str, tuple[str, str]] = {}
         for key, value in config.items():
-            await self.set_value(key, value)
+            value_type = self._detect_type(value)
+            serialized[key] = (self._serialize_value(value, value_type), value_type)
+
+        # One session and one commit for the whole update instead of one per key
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(ConfigDB).where(ConfigDB.key.in_(serialized.keys()))
+            )
+            existing = {item.key: item for item in result.scalars().all()}
+
+            for key, (serialized_value, value_type) in serialized.items():
+                item = existing.get(key)
+                if item:
+                    item.value = serialized_value
+                    item.value_type = value_type
+                else:
+                    session.add(ConfigDB(key=key, value=serialized_value, value_type=value_type))
+
+            await session.commit()
+        self._cache_generation += 1
+
+        if self._cache is not None:
+            for key, (serialized_value, value_type) in serialized.items():
+                self._cache[key] = self._parse_value(serialized_value, value_type)
+
+    async def set_defaults(self, defaults: dict[str, Any]) -> None:
+        """
+        Store default values for keys that have no value yet.
+
+        Existing values are read with a single query and all missing defaults
+        are written in one transaction, instead of a lookup per key.
+
+        Args:
+            defaults: Dictionary of key-value defaults
+        """
+        config = await self.get_config()
+        missing = {key: value for key, value in defaults.items() if config.get(key) is None}
+        if not missing:
+            return
+
+        rows = {}
+        for key, value in missing.items():
+            value_type = self._detect_type(value)
+            rows[key] = (self._serialize_value(value, value_type), value_type)
+        # Cache the values as they will be read back, not the caller's (mutable) objects
+        parsed = {key: self._parse_value(*row) for key, row in rows.items()}
+
+        async with AsyncSessionLocal() as session:
+            # Keys stored with a NULL value already have a row; fill those in place
+            null_keys = [key for key in rows if key in config]
+            if null_keys:
+                result = await session.execute(select(ConfigDB).where(ConfigDB.key.in_(null_keys)))
+                for item in result.scalars():
+                    item.value, item.value_type = rows.pop(item.key)
+
+            # Insert the rest together instead of a merge() lookup per key
+            session.add_all(
+                ConfigDB(key=key, value=serialized_value, value_type=value_type)
+                for key, (serialized_value, value_type) in rows.items()
+            )
+            await session.commit()
+        self._cache_generation += 1
+
+        if self._cache is not None:
+            self._cache.update(parsed)
 
     def _detect_type(self, value: Any) -> str:
         """Detect the type of a value."""
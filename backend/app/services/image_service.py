@@ -1,11 +1,19 @@
 """Image service for managing photo slideshow."""
 
 import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 from PIL import Image, ImageOps
 
+# Image file extensions picked up by scans and accepted for upload
+SUPPORTED_FORMATS = frozenset({".jpg", ".jpeg", ".png", ".webp", ".gif"})
+
+# Each thumbnail worker holds a fully decoded photo, so keep peak memory low on a Raspberry Pi
+MAX_THUMBNAIL_WORKERS = 2
+
 
 class ImageService:
     """Service for managing images for slideshow."""
@@ -23,8 +31,11 @@ class ImageService:
         self.thumbnail_dir = Path(thumbnail_dir) if thumbnail_dir else self.image_dir / "thumbnails"
         self.thumbnail_dir.mkdir(parents=True, exist_ok=True)
         self.thumbnail_size = (200, 200)  # Thumbnail size in pixels
-        self.supported_formats = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
+        self.supported_formats = SUPPORTED_FORMATS
         self._images: list[dict] = []
+        self._images_by_id: dict[str, dict] = {}  # Index built on scan for O(1) lookups
+        # Metadata from previous scans, keyed by path -> ((mtime_ns, size), metadata)
+        self._metadata_cache: dict[str, tuple[tuple[int, int], dict]] = {}
         self._current_index = 0
         self._last_scan: datetime | None = None
         self._scan_interval = 60  # Rescan every 60 seconds
@@ -42,44 +53,65 @@ class ImageService:
             return self._images
 
         images = []
+        missing_thumbnails: list[tuple[Path, Path]] = []
         if not self.image_dir.exists():
             self._images = []
+            self._images_by_id = {}
+            self._metadata_cache = {}
             self._last_scan = now
             return []
 
-        for file_path in sorted(self.image_dir.iterdir()):
-            if file_path.is_file() and file_path.suffix.lower() in self.supported_formats:
+        metadata_cache: dict[str, tuple[tuple[int, int], dict]] = {}
+        # scandir entries carry the file type from the directory read, so
+        # is_file() needs no extra stat call per entry
+        with os.scandir(self.image_dir) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        for entry in entries:
+            # Work with the entry's own strings; a Path is only built for thumbnails
+            file_path = entry.path
+            file_format = os.path.splitext(entry.name)[1].lower()
+            if entry.is_file() and file_format in self.supported_formats:
                 try:
-                    # Get image metadata
-                    with Image.open(file_path) as img:
-                        width, height = img.size
-                        # Get file size
-                        file_size = file_path.stat().st_size
+                    stat = entry.stat()
+                    signature = (stat.st_mtime_ns, stat.st_size)
+                    cached = self._metadata_cache.get(file_path)
+                    if cached and cached[0] == signature:
+                        # Unchanged since the last scan, skip re-opening the file
+                        image = cached[1]
+                    else:
+                        # Get image metadata
+                        with Image.open(file_path) as img:
+                            width, height = img.size
 
                         # Generate image ID from file path hash
-                        image_id = hashlib.md5(str(file_path).encode()).hexdigest()
-
-                        # Generate thumbnail if it doesn't exist
-                        thumbnail_path = self._get_thumbnail_path(image_id)
-                        if not thumbnail_path.exists():
-                            self._generate_thumbnail(file_path, thumbnail_path)
-
-                        images.append(
-                            {
-                                "id": image_id,
-                                "filename": file_path.name,
-                                "path": str(file_path),
-                                "width": width,
-                                "height": height,
-                                "size": file_size,
-                                "format": file_path.suffix.lower(),
-                            }
-                        )
+                        image_id = hashlib.md5(file_path.encode()).hexdigest()
+
+                        image = {
+                            "id": image_id,
+                            "filename": entry.name,
+                            "path": file_path,
+                            "width": width,
+                            "height": height,
+                            "size": stat.st_size,
+                            "format": file_format,
+                        }
+
+                    # Queue thumbnail generation if it doesn't exist
+                    thumbnail_path = self._get_thumbnail_path(image["id"])
+                    if not thumbnail_path.exists():
+                        missing_thumbnails.append((Path(file_path), thumbnail_path))
+
+                    metadata_cache[file_path] = (signature, image)
+                    images.append(image)
                 except Exception as e:
                     print(f"Error reading image {file_path}: {e}")
                     continue
 
+        self._generate_thumbnails(missing_thumbnails)
+
         self._images = images
+        self._images_by_id = {img["id"]: img for img in images}
+        self._metadata_cache = metadata_cache  # Drops entries for deleted files
         self._last_scan = now
         return images
 
@@ -175,11 +207,7 @@ class ImageService:
         if not self._images:
             self.scan_images()
 
-        for img in self._images:
-            if img["id"] == image_id:
-                return img
-
-        return None
+        return self._images_by_id.get(image_id)
 
     def _get_thumbnail_path(self, image_id: str) -> Path:
         """
@@ -225,6 +253,28 @@ class ImageService:
         except Exception as e:
             print(f"Error generating thumbnail for {image_path}: {e}")
 
+    def _generate_thumbnails(self, pending: list[tuple[Path, Path]]) -> None:
+        """
+        Generate several thumbnails, in parallel when there is more than one.
+
+        Pillow releases the GIL while decoding and resizing, so a small thread
+        pool overlaps the work of a first scan over a large photo library. The
+        pool is capped at MAX_THUMBNAIL_WORKERS because every worker holds a
+        full-size decoded image.
+
+        Args:
+            pending: (image_path, thumbnail_path) pairs to generate
+        """
+        if len(pending) <= 1:
+            for image_path, thumbnail_path in pending:
+                self._generate_thumbnail(image_path, thumbnail_path)
+            return
+
+        workers = min(len(pending), MAX_THUMBNAIL_WORKERS, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # _generate_thumbnail handles its own errors, so just wait for completion
+            list(executor.map(lambda args: self._generate_thumbnail(*args), pending))
+
     def get_thumbnail_path(self, image_id: str) -> Path | None:
         """
         Get thumbnail path for an image by ID.
@@ -252,7 +302,7 @@ class ImageService:
             "thumbnail_dir": str(self.thumbnail_dir),
             "total_images": len(self._images),
             "current_index": self._current_index,
-            "supported_formats": list(self.supported_formats),
+            "supported_formats": sorted(self.supported_formats),
         }
 
 
@@ -1,10 +1,39 @@
 """Service for managing keyboard mappings."""
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, insert, select
 
 from app.database import AsyncSessionLocal
 from app.models.db_models import KeyboardMappingDB
 
+# Actions that can be bound to a key
+AVAILABLE_ACTIONS = (
+    # Mode selection buttons (4 buttons)
+    "mode_calendar",
+    "mode_photos",
+    "mode_web_services",
+    "mode_spare",
+    # Generic context-aware buttons (3 buttons)
+    "generic_next",
+    "generic_prev",
+    "generic_expand_close",
+    # Legacy/Advanced actions
+    "mode_settings",
+    "mode_cycle",
+    "calendar_next_month",
+    "calendar_prev_month",
+    "calendar_expand_today",
+    "calendar_collapse",
+    "images_next",
+    "images_prev",
+    "photos_enter_fullscreen",
+    "photos_exit_fullscreen",
+    "web_service_next",
+    "web_service_prev",
+    "web_service_close",
+    "web_service_enter_fullscreen",
+    "none",
+)
+
 
 class KeyboardMappingService:
     """Service for managing keyboard key-to-action mappings."""
@@ -64,26 +93,40 @@ class KeyboardMappingService:
             keyboard_type: '7-button' or 'standard'
             mappings: Dictionary mapping key codes to actions
         """
+        await self.set_all_mappings({keyboard_type: mappings})
+
+    async def set_all_mappings(self, all_mappings: dict[str, dict[str, str]]) -> None:
+        """
+        Replace keyboard mappings for several keyboard types in one transaction.
+
+        Args:
+            all_mappings: Dictionary with keyboard types as keys and mappings as values
+        """
+        if not all_mappings:
+            return
+
         async with AsyncSessionLocal() as session:
-            # Delete existing mappings for this keyboard type
+            # Delete existing mappings for these keyboard types
             await session.execute(
-                delete(KeyboardMappingDB).where(KeyboardMappingDB.keyboard_type == keyboard_type)
+                delete(KeyboardMappingDB).where(
+                    KeyboardMappingDB.keyboard_type.in_(all_mappings.keys())
+                )
             )
 
-            # Add new mappings
-            for key_code, action in mappings.items():
-                mapping = KeyboardMappingDB(
-                    keyboard_type=keyboard_type,
-                    key_code=key_code,
-                    action=action,
-                )
-                session.add(mapping)
+            # Add new mappings with one executemany INSERT instead of an ORM object per row
+            rows = [
+                {"keyboard_type": keyboard_type, "key_code": key_code, "action": action}
+                for keyboard_type, mappings in all_mappings.items()
+                for key_code, action in mappings.items()
+            ]
+            if rows:
+                await session.execute(insert(KeyboardMappingDB), rows)
 
             await session.commit()
 
-            # Update cache
-            cache_key = f"mappings_{keyboard_type}"
-            self._cache[cache_key] = mappings.copy()
+        # Update cache
+        for keyboard_type, mappings in all_mappings.items():
+            self._cache[f"mappings_{keyboard_type}"] = mappings.copy()
 
     async def set_mapping(self, keyboard_type: str, key_code: str, action: str) -> None:
         """
@@ -129,33 +172,7 @@ class KeyboardMappingService:
         Returns:
             List of action names
         """
-        return [
-            # Mode selection buttons (4 buttons)
-            "mode_calendar",
-            "mode_photos",
-            "mode_web_services",
-            "mode_spare",
-            # Generic context-aware buttons (3 buttons)
-            "generic_next",
-            "generic_prev",
-            "generic_expand_close",
-            # Legacy/Advanced actions
-            "mode_settings",
-            "mode_cycle",
-            "calendar_next_month",
-            "calendar_prev_month",
-            "calendar_expand_today",
-            "calendar_collapse",
-            "images_next",
-            "images_prev",
-            "photos_enter_fullscreen",
-            "photos_exit_fullscreen",
-            "web_service_next",
-            "web_service_prev",
-            "web_service_close",
-            "web_service_enter_fullscreen",
-            "none",
-        ]
+        return list(AVAILABLE_ACTIONS)
 
 
 # Global keyboard mapping service instance
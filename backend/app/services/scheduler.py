@@ -1,12 +1,15 @@
 """Scheduler service for periodic calendar updates."""
 
-from datetime import datetime, timedelta
+import logging
+from datetime import timedelta
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
 from app.services.calendar_service import calendar_service
 
+logger = logging.getLogger(__name__)
+
 
 class CalendarScheduler:
     """Scheduler for periodic calendar updates."""
@@ -23,10 +26,17 @@ class CalendarScheduler:
             # Schedule calendar refresh
             self.scheduler.add_job(
                 self.refresh_calendars,
-                trigger=IntervalTrigger(minutes=15),
+                trigger=IntervalTrigger(seconds=self.refresh_interval.total_seconds()),
                 id="refresh_calendars",
                 replace_existing=True,
             )
+            # Evict expired event cache entries once per cache TTL
+            self.scheduler.add_job(
+                calendar_service.sweep_cache,
+                trigger=IntervalTrigger(seconds=calendar_service.cache_ttl_seconds),
+                id="sweep_calendar_cache",
+                replace_existing=True,
+            )
 
     def stop(self):
         """Stop the scheduler."""
@@ -35,21 +45,17 @@ class CalendarScheduler:
 
     async def refresh_calendars(self):
         """Refresh calendar events for all sources."""
-        # Clear cache to force refresh
-        calendar_service._cache.clear()
-        print(f"Calendar cache cleared at {datetime.now()}")
+        # Re-fetch in the background instead of clearing, so the next request stays warm
+        refreshed = await calendar_service.refresh_cache()
+        logger.info("Refreshed %d calendar cache entries", refreshed)
 
     def set_refresh_interval(self, minutes: int):
         """Set the refresh interval in minutes."""
         self.refresh_interval = timedelta(minutes=minutes)
         if self.scheduler.running:
-            # Reschedule with new interval
-            self.scheduler.remove_job("refresh_calendars")
-            self.scheduler.add_job(
-                self.refresh_calendars,
-                trigger=IntervalTrigger(minutes=minutes),
-                id="refresh_calendars",
-                replace_existing=True,
+            # Reschedule in place so the job is never absent from the job store
+            self.scheduler.reschedule_job(
+                "refresh_calendars", trigger=IntervalTrigger(minutes=minutes)
             )
 
 
@@ -1,6 +1,11 @@
 """Web service management service."""
 
-from sqlalchemy import select
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import AsyncSessionLocal
 from app.models.db_models import WebServiceDB
@@ -12,78 +17,113 @@ class WebServiceService:
 
     def __init__(self):
         """Initialize web service service."""
-        self._services: list[WebService] = []
+        # Ordered service list, loaded on first read and dropped on every write
+        self._cache: list[WebService] | None = None
+        # Bumped on every write, so a read that overlapped one doesn't cache its old result
+        self._cache_generation = 0
+
+    @staticmethod
+    @asynccontextmanager
+    async def _session(session: AsyncSession | None) -> AsyncIterator[AsyncSession]:
+        """
+        Use the caller's session if given, otherwise open a new one for this call.
 
-    async def get_services(self) -> list[WebService]:
+        Args:
+            session: Session owned by the caller (e.g. request-scoped), or None
+
+        Yields:
+            Database session
+        """
+        if session is not None:
+            yield session
+        else:
+            async with AsyncSessionLocal() as new_session:
+                yield new_session
+
+    def _invalidate_cache(self) -> None:
+        """Drop the cached service list after a write."""
+        self._cache = None
+        self._cache_generation += 1
+
+    @staticmethod
+    def _to_web_service(db_service: WebServiceDB) -> WebService:
+        """
+        Convert a database row to a web service model.
+
+        Args:
+            db_service: Web service database row
+
+        Returns:
+            Web service
+        """
+        return WebService.model_validate(db_service)
+
+    async def get_services(self, session: AsyncSession | None = None) -> list[WebService]:
         """
         Get all web services, ordered by display_order.
 
+        Args:
+            session: Optional session to use; a new one is opened if omitted
+
         Returns:
             List of web services
         """
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(WebServiceDB).order_by(WebServiceDB.display_order, WebServiceDB.name)
-            )
-            db_services = result.scalars().all()
-
-            services = []
-            for db_service in db_services:
-                services.append(
-                    WebService(
-                        id=db_service.id,
-                        name=db_service.name,
-                        url=db_service.url,
-                        enabled=db_service.enabled,
-                        display_order=db_service.display_order,
-                        fullscreen=db_service.fullscreen,
-                    )
+        if self._cache is None:
+            generation = self._cache_generation
+            async with self._session(session) as session:
+                result = await session.execute(
+                    select(WebServiceDB).order_by(WebServiceDB.display_order, WebServiceDB.name)
                 )
+                db_services = result.scalars().all()
+
+            services = [self._to_web_service(db_service) for db_service in db_services]
+            if generation != self._cache_generation:
+                # A write committed while this read was in flight; don't cache what may be stale
+                return services
+            self._cache = services
 
-            self._services = services
-            return services
+        # Return a copy so callers can't reorder or extend the cached list
+        return list(self._cache)
 
-    async def get_service(self, service_id: str) -> WebService | None:
+    async def get_service(
+        self, service_id: str, session: AsyncSession | None = None
+    ) -> WebService | None:
         """
         Get a web service by ID.
 
         Args:
             service_id: Service ID
+            session: Optional session to use; a new one is opened if omitted
 
         Returns:
             Web service or None if not found
         """
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(WebServiceDB).where(WebServiceDB.id == service_id)
-            )
-            db_service = result.scalar_one_or_none()
+        async with self._session(session) as session:
+            # Primary key lookup; served from the identity map if the session already has it
+            db_service = await session.get(WebServiceDB, service_id)
 
             if db_service:
-                return WebService(
-                    id=db_service.id,
-                    name=db_service.name,
-                    url=db_service.url,
-                    enabled=db_service.enabled,
-                    display_order=db_service.display_order,
-                    fullscreen=db_service.fullscreen,
-                )
+                return self._to_web_service(db_service)
             return None
 
-    async def add_service(self, service: WebServiceCreate) -> WebService:
+    async def add_service(
+        self, service: WebServiceCreate, session: AsyncSession | None = None
+    ) -> WebService:
         """
         Add a new web service.
 
         Args:
             service: Web service to add
+            session: Optional session to use; a new one is opened if omitted
 
         Returns:
             Created web service
         """
-        # Generate ID if not provided
-        service_id = f"web-service-{len(self._services) + 1}-{hash(service.url) % 10000}"
+        # uuid4 is random per call; unlike hash() it doesn't depend on per-process hash
+        # seeding, and unlike a row-count suffix it can't collide after deletions
+        service_id = f"web-service-{uuid.uuid4().hex[:12]}"
 
-        async with AsyncSessionLocal() as session:
+        async with self._session(session) as session:
             db_service = WebServiceDB(
                 id=service_id,
                 name=service.name,
@@ -93,94 +133,85 @@ class WebServiceService:
                 fullscreen=service.fullscreen,
             )
             session.add(db_service)
+            # All columns are set explicitly above, so no refresh round-trip is needed
             await session.commit()
-            await session.refresh(db_service)
-
-            return WebService(
-                id=db_service.id,
-                name=db_service.name,
-                url=db_service.url,
-                enabled=db_service.enabled,
-                display_order=db_service.display_order,
-                fullscreen=db_service.fullscreen,
-            )
+            self._invalidate_cache()
+
+            return self._to_web_service(db_service)
 
-    async def update_service(self, service_id: str, updates: WebServiceUpdate) -> WebService | None:
+    async def update_service(
+        self,
+        service_id: str,
+        updates: WebServiceUpdate,
+        session: AsyncSession | None = None,
+    ) -> WebService | None:
         """
         Update a web service.
 
         Args:
             service_id: Service ID
             updates: Updates to apply
+            session: Optional session to use; a new one is opened if omitted
 
         Returns:
             Updated web service or None if not found
         """
-        async with AsyncSessionLocal() as session:
+        # Only fields that were provided are changed
+        values = updates.model_dump(exclude_none=True)
+        if not values:
+            return await self.get_service(service_id, session)
+
+        # Single UPDATE ... RETURNING instead of SELECT, modify, flush
+        async with self._session(session) as session:
             result = await session.execute(
-                select(WebServiceDB).where(WebServiceDB.id == service_id)
+                update(WebServiceDB)
+                .where(WebServiceDB.id == service_id)
+                .values(**values)
+                .returning(WebServiceDB)
             )
             db_service = result.scalar_one_or_none()
-
             if not db_service:
                 return None
 
-            # Update fields if provided
-            if updates.name is not None:
-                db_service.name = updates.name
-            if updates.url is not None:
-                db_service.url = updates.url
-            if updates.enabled is not None:
-                db_service.enabled = updates.enabled
-            if updates.display_order is not None:
-                db_service.display_order = updates.display_order
-            if updates.fullscreen is not None:
-                db_service.fullscreen = updates.fullscreen
-
             await session.commit()
-            await session.refresh(db_service)
-
-            return WebService(
-                id=db_service.id,
-                name=db_service.name,
-                url=db_service.url,
-                enabled=db_service.enabled,
-                display_order=db_service.display_order,
-                fullscreen=db_service.fullscreen,
-            )
+            self._invalidate_cache()
 
-    async def remove_service(self, service_id: str) -> bool:
+            return self._to_web_service(db_service)
+
+    async def remove_service(self, service_id: str, session: AsyncSession | None = None) -> bool:
         """
         Remove a web service.
 
         Args:
             service_id: Service ID
+            session: Optional session to use; a new one is opened if omitted
 
         Returns:
             True if removed, False if not found
         """
-        async with AsyncSessionLocal() as session:
+        async with self._session(session) as session:
             result = await session.execute(
-                select(WebServiceDB).where(WebServiceDB.id == service_id)
+                delete(WebServiceDB).where(WebServiceDB.id == service_id).returning(WebServiceDB.id)
             )
-            db_service = result.scalar_one_or_none()
-
-            if not db_service:
+            if result.scalar_one_or_none() is None:
                 return False
 
-            await session.delete(db_service)
             await session.commit()
+            self._invalidate_cache()
             return True
 
-    async def get_enabled_services(self) -> list[WebService]:
+    async def get_enabled_services(self, session: AsyncSession | None = None) -> list[WebService]:
         """
         Get all enabled web services, ordered by display_order.
 
+        Args:
+            session: Optional session to use; a new one is opened if omitted
+
         Returns:
             List of enabled web services
         """
-        all_services = await self.get_services()
-        return [s for s in all_services if s.enabled]
+        # Filtering the cached list is cheaper than another query
+        return [s for s in await self.get_services(session) if s.enabled]
 
 
 # Global web service instance
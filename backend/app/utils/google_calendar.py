@@ -1,7 +1,31 @@
 """Google Calendar utility functions."""
 
 import re
-from urllib.parse import quote
+from functools import lru_cache
+from urllib.parse import SplitResult, quote, urlsplit
+
+# Calendar ID query parameter of a share URL, e.g. ...?cid=EMAIL@group.calendar.google.com
+_CID_RE = re.compile(r"[?&]cid=([^&]+)")
+
+
+def _split_url(url: str) -> SplitResult | None:
+    """
+    Split a URL, assuming https:// if the scheme was left off.
+
+    Args:
+        url: URL to split, e.g. "calendar.google.com/calendar/u/0?cid=..."
+
+    Returns:
+        URL parts, or None if the URL is malformed (e.g. an unclosed IPv6 bracket)
+    """
+    try:
+        parts = urlsplit(url)
+        if not parts.scheme:
+            # Pasted without a scheme; the host would otherwise be read as the path
+            parts = urlsplit(f"https://{url}")
+    except ValueError:
+        return None
+    return parts
 
 
 def convert_share_url_to_ical(share_url: str) -> str | None:
@@ -17,7 +41,7 @@ def convert_share_url_to_ical(share_url: str) -> str | None:
     """
     # Extract calendar ID from share URL
     # Pattern: https://calendar.google.com/calendar/u/0?cid=EMAIL@group.calendar.google.com
-    cid_match = re.search(r"[?&]cid=([^&]+)", share_url)
+    cid_match = _CID_RE.search(share_url)
     if not cid_match:
         return None
 
@@ -44,15 +68,19 @@ def is_google_calendar_url(url: str) -> bool:
     Returns:
         True if it's a Google Calendar URL
     """
-    return "calendar.google.com" in url
+    # Compare the host, not a substring: "https://evil.example/?calendar.google.com" is not one
+    parts = _split_url(url)
+    return parts is not None and parts.hostname == "calendar.google.com"
 
 
+@lru_cache(maxsize=128)
 def normalize_google_calendar_url(url: str) -> str:
     """
     Normalize Google Calendar URL to iCal format.
 
     If it's already an iCal URL (including private URLs with tokens), return as-is.
-    If it's a share URL, convert to iCal.
+    If it's a share URL, convert to iCal. Results are memoized, since the same few
+    source URLs are normalized on every calendar request.
 
     Args:
         url: Google Calendar URL (share or iCal, including private URLs)
@@ -60,13 +88,18 @@ def normalize_google_calendar_url(url: str) -> str:
     Returns:
         iCal feed URL
     """
-    # If already an iCal URL (ends with .ics or has /ical/ in path), return as-is
+    # If already an iCal URL (path ends with .ics or contains /ical/), return as-is
     # This includes private URLs like: /ical/.../private-.../basic.ics
-    if url.endswith(".ics") or "/ical/" in url:
+    # Split once and classify from the parts instead of re-parsing per check
+    parts = _split_url(url)
+    if parts is None:
+        # Malformed URL; leave it to the feed fetch to report the error
+        return url
+    if parts.path.endswith(".ics") or "/ical/" in parts.path:
         return url
 
     # If it's a share URL, convert it
-    if is_google_calendar_url(url):
+    if parts.hostname == "calendar.google.com":
         ical_url = convert_share_url_to_ical(url)
         if ical_url:
             return ical_url
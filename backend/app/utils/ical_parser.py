@@ -1,12 +1,22 @@
 """iCal/ICS file parser for Google Calendar share links."""
 
-from datetime import UTC, datetime
+import asyncio
+import traceback
+from datetime import UTC, datetime, timedelta
 
 import httpx
 from icalendar import Calendar
 
 from app.models.calendar import CalendarEvent
 
+# Day boundaries for all-day events, built once instead of per event
+_START_OF_DAY = datetime.min.time()
+_END_OF_DAY = datetime.max.time()
+_ONE_DAY = timedelta(days=1)
+
+# Upper bound on a downloaded feed; years of events are typically well under 1 MB
+MAX_ICAL_BYTES = 20 * 1024 * 1024
+
 
 async def parse_ical_from_url(url: str) -> list[CalendarEvent]:
     """
@@ -22,22 +32,26 @@ async def parse_ical_from_url(url: str) -> list[CalendarEvent]:
 
     try:
         async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-
-            # Check if we got valid iCal content
-            content_type = response.headers.get("content-type", "").lower()
-            if "text/calendar" not in content_type and "text/plain" not in content_type:
-                print(f"Warning: Unexpected content type {content_type} for iCal URL")
-
-            # Parse iCal content
-            calendar = Calendar.from_ical(response.content)
-
-            for component in calendar.walk():
-                if component.name == "VEVENT":
-                    event = _parse_vevent(component)
-                    if event:
-                        events.append(event)
+            async with client.stream("GET", url) as response:
+                if response.is_error:
+                    # Load the body so the error handler below can show it
+                    await response.aread()
+                response.raise_for_status()
+
+                # Check if we got valid iCal content
+                content_type = response.headers.get("content-type", "").lower()
+                if "text/calendar" not in content_type and "text/plain" not in content_type:
+                    print(f"Warning: Unexpected content type {content_type} for iCal URL")
+
+                # Stream the body so an oversized feed is rejected without buffering all of it
+                content = bytearray()
+                async for chunk in response.aiter_bytes():
+                    content += chunk
+                    if len(content) > MAX_ICAL_BYTES:
+                        raise ValueError(f"iCal feed exceeds {MAX_ICAL_BYTES} bytes")
+
+            # Parsing is CPU-bound, so keep it off the event loop
+            events = await asyncio.to_thread(_parse_ical_content, bytes(content))
 
             print(f"Parsed {len(events)} events from iCal URL")
     except httpx.HTTPStatusError as e:
@@ -46,14 +60,36 @@ async def parse_ical_from_url(url: str) -> list[CalendarEvent]:
         raise
     except Exception as e:
         print(f"Error parsing iCal from URL {url[:80]}...: {e}")
-        import traceback
-
         traceback.print_exc()
         raise
 
     return events
 
 
+def _parse_ical_content(content: bytes) -> list[CalendarEvent]:
+    """
+    Parse raw iCal/ICS content into calendar events.
+
+    Args:
+        content: iCal/ICS file content
+
+    Returns:
+        List of calendar events
+    """
+    events: list[CalendarEvent] = []
+    calendar = Calendar.from_ical(content)
+
+    # VEVENTs are direct children of VCALENDAR, so skip walk()'s recursion into
+    # VTIMEZONE rules and the VALARMs nested inside each event
+    for component in calendar.subcomponents:
+        if component.name == "VEVENT":
+            event = _parse_vevent(component)
+            if event:
+                events.append(event)
+
+    return events
+
+
 def _parse_vevent(component) -> CalendarEvent | None:
     """
     Parse a VEVENT component into a CalendarEvent.
@@ -65,19 +101,20 @@ def _parse_vevent(component) -> CalendarEvent | None:
         CalendarEvent or None if parsing fails
     """
     try:
-        # Extract event data
-        uid = str(component.get("UID", ""))
-        summary = str(component.get("SUMMARY", "No Title"))
-        description = str(component.get("DESCRIPTION", ""))
-        location = str(component.get("LOCATION", ""))
-
-        # Parse dates
+        # Parse dates first so undated components are skipped before any text is copied
         dtstart = component.get("DTSTART")
         dtend = component.get("DTEND")
 
         if not dtstart or not dtend:
             return None
 
+        # Extract event data; optional text (DESCRIPTION can be large) is only
+        # converted to str when present
+        uid = str(component.get("UID", ""))
+        summary = str(component.get("SUMMARY", "No Title"))
+        description = component.get("DESCRIPTION")
+        location = component.get("LOCATION")
+
         # Handle both datetime and date-only
         start_dt = dtstart.dt
         end_dt = dtend.dt
@@ -91,7 +128,7 @@ def _parse_vevent(component) -> CalendarEvent | None:
                 start = start_dt
         else:
             # Date-only (all-day event) - use UTC midnight
-            start = datetime.combine(start_dt, datetime.min.time(), tzinfo=UTC)
+            start = datetime.combine(start_dt, _START_OF_DAY, tzinfo=UTC)
 
         if isinstance(end_dt, datetime):
             # Keep timezone-aware datetimes as-is (for proper timezone handling)
@@ -107,30 +144,25 @@ def _parse_vevent(component) -> CalendarEvent | None:
             # So if DTEND is 2024-01-04, the event actually ends on 2024-01-03 (inclusive)
             # Example: A 3-day event Jan 1-3 has DTSTART=2024-01-01, DTEND=2024-01-04
             # We need to subtract one day to get the actual last day of the event
-            from datetime import timedelta
-
-            actual_end_date = end_dt - timedelta(days=1)
+            actual_end_date = end_dt - _ONE_DAY
             # Use end of the actual last day (23:59:59.999999) to represent the full day
             # When we extract calendar date in frontend, this will correctly be Jan 3
-            end = datetime.combine(actual_end_date, datetime.max.time(), tzinfo=UTC)
+            end = datetime.combine(actual_end_date, _END_OF_DAY, tzinfo=UTC)
 
         # Check if all-day event
         all_day = not isinstance(dtstart.dt, datetime)
 
         # Get color if available
-        color = None
-        if hasattr(component, "get"):
-            color_prop = component.get("COLOR")
-            if color_prop:
-                color = str(color_prop)
+        color_prop = component.get("COLOR")
+        color = str(color_prop) if color_prop else None
 
         event = CalendarEvent(
             id=uid,
             title=summary,
             start=start,
             end=end,
-            description=description if description else None,
-            location=location if location else None,
+            description=str(description) if description else None,
+            location=str(location) if location else None,
             source="google",  # Assume Google Calendar for now
             color=color,
             all_day=all_day,
@@ -156,13 +188,8 @@ async def parse_ical_from_file(file_path: str) -> list[CalendarEvent]:
 
     try:
         with open(file_path, "rb") as f:
-            calendar = Calendar.from_ical(f.read())
-
-            for component in calendar.walk():
-                if component.name == "VEVENT":
-                    event = _parse_vevent(component)
-                    if event:
-                        events.append(event)
+            content = f.read()
+        events = await asyncio.to_thread(_parse_ical_content, content)
     except Exception as e:
         print(f"Error parsing iCal from file {file_path}: {e}")
         raise
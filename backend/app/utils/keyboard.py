@@ -1,6 +1,8 @@
 """Keyboard input handling with platform support."""
 
+import glob
 import platform
+from pathlib import Path
 
 # Platform detection
 IS_LINUX = platform.system() == "Linux"
@@ -26,6 +28,39 @@ else:
     categorize = None
     ecodes = None
 
+# Device path found by the last successful auto-detection, reused by later handlers
+_detected_device_path: str | None = None
+
+# Kernel listing of input devices and their handlers
+PROC_INPUT_DEVICES = Path("/proc/bus/input/devices")
+
+
+def _keyboard_event_paths() -> list[str]:
+    """
+    List event device nodes the kernel attached a keyboard handler to.
+
+    Reads /proc/bus/input/devices instead of opening every /dev/input/event* node.
+
+    Returns:
+        Device paths of keyboard-like devices, or all event nodes if /proc is unavailable
+    """
+    try:
+        content = PROC_INPUT_DEVICES.read_text()
+    except OSError:
+        return sorted(glob.glob("/dev/input/event*"))
+
+    paths = []
+    # One handler line per device, e.g. "H: Handlers=sysrq kbd leds event3"
+    for line in content.splitlines():
+        if not line.startswith("H: Handlers="):
+            continue
+        handlers = line.removeprefix("H: Handlers=").split()
+        if "kbd" in handlers:
+            paths.extend(
+                f"/dev/input/{handler}" for handler in handlers if handler.startswith("event")
+            )
+    return paths
+
 
 class KeyboardHandler:
     """Keyboard input handler with platform support."""
@@ -74,20 +109,26 @@ class KeyboardHandler:
 
     def _auto_detect_keyboard(self):
         """Auto-detect keyboard device on Linux."""
+        global _detected_device_path
+
         if not EVDEV_AVAILABLE:
             return None
 
         try:
-            import glob
-
-            devices = glob.glob("/dev/input/event*")
+            devices = _keyboard_event_paths()
+            # Try the previously detected device first; it is almost always still the keyboard
+            if _detected_device_path in devices:
+                devices.remove(_detected_device_path)
+                devices.insert(0, _detected_device_path)
 
             for device_path in devices:
                 try:
                     device = InputDevice(device_path)
                     # Check if it's a keyboard
                     if ecodes.EV_KEY in device.capabilities():
+                        _detected_device_path = device_path
                         return device
+                    device.close()
                 except Exception:
                     continue
         except Exception:
@@ -1,17 +1,22 @@
 """Database migration utilities."""
 
 import asyncio
+import logging
 import sqlite3
 from pathlib import Path
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Stored in PRAGMA user_version once migrations have run; bump it when adding a migration
+CURRENT_SCHEMA_VERSION = 3
+
 
 async def migrate_database():
     """Run database migrations."""
-    # Run in executor to avoid blocking
-    loop = asyncio.get_event_loop()
-    await loop.run_in_executor(None, _migrate_database_sync)
+    # Run in a worker thread to avoid blocking the event loop
+    await asyncio.to_thread(_migrate_database_sync)
 
 
 def _migrate_database_sync():
@@ -25,44 +30,60 @@ def _migrate_database_sync():
         return
 
     conn = sqlite3.connect(str(db_path))
+    # Row objects allow access by column name without building a dict per row
+    conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
     try:
-        # Check if calendar_sources table exists
+        # Up-to-date databases need no introspection at all
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] >= CURRENT_SCHEMA_VERSION:
+            return
+
+        # An empty database file has no schema yet; init_db creates the current one
+        cursor.execute("PRAGMA schema_version")
+        if cursor.fetchone()[0] == 0:
+            return
+
+        # WAL avoids rewriting a rollback journal on every commit and, unlike the other
+        # pragmas, persists in the database file. synchronous=NORMAL is safe with WAL.
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-8000")  # 8 MB page cache for the DDL below
+
+        # Apply every schema change in one transaction: one fsync, and all-or-nothing.
+        # sqlite3 does not open transactions for DDL on its own, so begin explicitly.
+        cursor.execute("BEGIN")
+
+        # Look up every table the migration cares about in one query
         cursor.execute("""
             SELECT name FROM sqlite_master
-            WHERE type='table' AND name='calendar_sources'
+            WHERE type='table' AND name IN ('calendar_sources', 'web_services', 'keyboard_mappings')
         """)
-        if not cursor.fetchone():
+        tables = {row["name"] for row in cursor}
+        if "calendar_sources" not in tables:
             # Table doesn't exist, will be created by init_db
             return
 
         # Check if color column exists
-        cursor.execute("PRAGMA table_info(calendar_sources)")
-        columns = [row[1] for row in cursor.fetchall()]
+        cursor.execute("SELECT name FROM pragma_table_info('calendar_sources')")
+        columns = {row["name"] for row in cursor}
 
         # Add color column if it doesn't exist
         if "color" not in columns:
-            print("Adding 'color' column to calendar_sources table...")
+            logger.info("Adding 'color' column to calendar_sources table")
             cursor.execute("ALTER TABLE calendar_sources ADD COLUMN color TEXT")
-            conn.commit()
-            print("Added 'color' column")
 
         # Add show_time column if it doesn't exist
         if "show_time" not in columns:
-            print("Adding 'show_time' column to calendar_sources table...")
+            logger.info("Adding 'show_time' column to calendar_sources table")
             cursor.execute("ALTER TABLE calendar_sources ADD COLUMN show_time BOOLEAN DEFAULT 1")
-            conn.commit()
-            print("Added 'show_time' column")
 
         # Check if web_services table exists
-        cursor.execute("""
-            SELECT name FROM sqlite_master
-            WHERE type='table' AND name='web_services'
-        """)
-        if not cursor.fetchone():
+        if "web_services" not in tables:
             # Create web_services table
-            print("Creating 'web_services' table...")
+            logger.info("Creating 'web_services' table")
             cursor.execute("""
                 CREATE TABLE web_services (
                     id TEXT PRIMARY KEY,
@@ -73,12 +94,27 @@ def _migrate_database_sync():
                     fullscreen BOOLEAN DEFAULT 0 NOT NULL
                 )
             """)
-            conn.commit()
-            print("Created 'web_services' table")
 
-        print("Database migration completed")
-    except Exception as e:
-        print(f"Error during migration: {e}")
+        # Index backing the (display_order, name) ordering of the services list.
+        # init_db only creates indexes along with new tables, so add it to existing ones here.
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_web_services_order "
+            "ON web_services (display_order, name)"
+        )
+
+        # Index for the per-keyboard-type mapping lookups, deletes and single-key updates
+        if "keyboard_mappings" in tables:
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_keyboard_mappings_type "
+                "ON keyboard_mappings (keyboard_type, key_code)"
+            )
+
+        cursor.execute(f"PRAGMA user_version = {CURRENT_SCHEMA_VERSION}")
+
+        conn.commit()
+        logger.info("Database migrated to schema version %d", CURRENT_SCHEMA_VERSION)
+    except Exception:
+        logger.exception("Error during migration")
         conn.rollback()
         raise
     finally:
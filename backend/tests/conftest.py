@@ -1,25 +1,86 @@
 """Pytest configuration and shared fixtures."""
 
-import asyncio
+import os
+import shutil
+import sys
 import tempfile
+import uuid
 from collections.abc import AsyncGenerator, Generator
 from pathlib import Path
 
 import pytest
 import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
 from fastapi.testclient import TestClient
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
-
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import StaticPool
+
+import app.database
+import app.models.db_models  # noqa: F401 - registers the tables on Base.metadata
+from app.api.routes import calendar, config, health, images, keyboard, web_services
 from app.database import Base
+from app.services import calendar_service as calendar_service_module
+from app.services import config_service, keyboard_mapping_service, web_service_service
+from app.services.calendar_service import calendar_service
 
+# RAM-backed filesystem for pytest's temporary directories on Linux
+SHM_DIR = Path("/dev/shm")
+_shm_basetemp_key = pytest.StashKey[str]()
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+# Modules that import the app's session factory by name and so must be patched individually
+_SESSION_FACTORY_MODULES = (
+    app.database,
+    calendar_service_module,
+    config_service,
+    keyboard_mapping_service,
+    web_service_service,
+)
+
+
+def _use_session_factory(
+    monkeypatch: pytest.MonkeyPatch, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Make the app's services open their sessions from ``session_factory``."""
+    for module in _SESSION_FACTORY_MODULES:
+        monkeypatch.setattr(module, "AsyncSessionLocal", session_factory)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config: pytest.Config):
+    """Keep pytest's temporary directories in memory when /dev/shm is available."""
+    if config.option.basetemp is None and sys.platform.startswith("linux"):
+        if SHM_DIR.is_dir() and os.access(SHM_DIR, os.W_OK):
+            # Unique per run: pytest empties a given basetemp before using it
+            config.option.basetemp = str(SHM_DIR / f"calvin-pytest-{os.getpid()}")
+            config.stash[_shm_basetemp_key] = config.option.basetemp
+
+
+def pytest_unconfigure(config: pytest.Config):
+    """Remove the /dev/shm base directory; pytest does not prune a given basetemp."""
+    basetemp = config.stash.get(_shm_basetemp_key, None)
+    if basetemp:
+        shutil.rmtree(basetemp, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def _reset_calendar_service() -> Generator[None, None, None]:
+    """Start every test with no calendar sources and an empty event cache."""
+    original_sources = calendar_service._sources_by_id
+    calendar_service._sources_by_id = {}
+    calendar_service._cache.clear()
+
+    yield
+
+    # Only the in-memory state is restored; rows the test added live in the test database
+    calendar_service._sources_by_id = original_sources
+    calendar_service._cache.clear()
 
 
 @pytest.fixture
@@ -33,62 +94,73 @@ def temp_db_path() -> Generator[Path, None, None]:
         db_path.unlink()
 
 
-@pytest_asyncio.fixture
-async def test_engine(temp_db_path: Path) -> AsyncGenerator[AsyncEngine, None]:
-    """Create a test database engine."""
-    test_db_url = f"sqlite+aiosqlite:///{temp_db_path}"
-    engine = create_async_engine(test_db_url, echo=False)
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def mem_engine() -> AsyncGenerator[AsyncEngine, None]:
+    """Create an in-memory test database engine with the schema, once per session."""
+    # A unique name keeps shared-cache databases of concurrent sessions apart
+    db_url = f"sqlite+aiosqlite:///file:test-{uuid.uuid4().hex}?mode=memory&cache=shared&uri=true"
+    # One connection for the whole session, so the database lives until the engine is disposed
+    engine = create_async_engine(db_url, echo=False, poolclass=StaticPool)
+
+    # The sqlite3 driver's implicit transactions break SAVEPOINT; let SQLAlchemy emit BEGIN
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
 
-    # Create all tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
     yield engine
 
-    # Cleanup
     await engine.dispose()
 
 
-@pytest_asyncio.fixture
-async def test_db(test_engine: AsyncEngine) -> AsyncGenerator[AsyncSession, None]:
-    """Create a test database session."""
-    async_session = sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
-
-    async with async_session() as session:
-        yield session
-
+@pytest.fixture(scope="session", autouse=True)
+def _app_database(mem_engine: AsyncEngine) -> Generator[None, None, None]:
+    """Point the app's engine and sessions at the in-memory database, never data/db."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(app.database, "engine", mem_engine)
+        _use_session_factory(
+            monkeypatch,
+            async_sessionmaker(mem_engine, class_=AsyncSession, expire_on_commit=False),
+        )
+        yield
 
-@pytest.fixture
-def test_client(temp_db_path: Path) -> Generator[TestClient, None, None]:
-    """Create a test client for FastAPI."""
-    # Patch the database URL in settings
-    import app.config
-
-    original_db_url = app.config.settings.database_url
-    app.config.settings.database_url = f"sqlite:///{temp_db_path}"
 
-    # Recreate database connection with test database
-    import asyncio
+@pytest_asyncio.fixture
+async def test_db(
+    mem_engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+) -> AsyncGenerator[AsyncSession, None]:
+    """Create a test database session whose changes are rolled back after the test."""
+    async with mem_engine.connect() as conn:
+        transaction = await conn.begin()
+        # Commits inside the test only release a savepoint of the outer transaction
+        async_session = async_sessionmaker(
+            bind=conn,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        # Services join the same transaction, so their writes are rolled back too
+        _use_session_factory(monkeypatch, async_session)
+
+        async with async_session() as session:
+            yield session
+
+        await transaction.rollback()
 
-    from app.database import init_db
-    from app.utils.migrations import migrate_database
 
-    # Initialize test database
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        loop.run_until_complete(init_db())
-        loop.run_until_complete(migrate_database())
-    finally:
-        loop.close()
+@pytest.fixture(scope="session")
+def test_client() -> Generator[TestClient, None, None]:
+    """Create a test client for FastAPI, shared by the whole session."""
+    # The app database is already the in-memory one with the schema (see _app_database)
 
     # Create a test app without the complex lifespan
     # This avoids startup issues in tests
-    from fastapi import FastAPI
-    from fastapi.middleware.cors import CORSMiddleware
-
-    from app.api.routes import calendar, config, health, images, keyboard, web_services
-
     test_app = FastAPI(title="Calvin Test API")
     test_app.add_middleware(
         CORSMiddleware,
@@ -112,20 +184,16 @@ def test_client(temp_db_path: Path) -> Generator[TestClient, None, None]:
     with TestClient(test_app) as client:
         yield client
 
-    # Restore original database URL
-    app.config.settings.database_url = original_db_url
 
-
-@pytest.fixture
-def temp_image_dir() -> Generator[Path, None, None]:
-    """Create a temporary directory for test images."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+@pytest.fixture(scope="session")
+def _temp_image_root(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Session directory holding every test's image directory; pytest cleans it up."""
+    return tmp_path_factory.mktemp("images", numbered=False)
 
 
 @pytest.fixture
-def mock_env_vars(monkeypatch, temp_db_path: Path, temp_image_dir: Path):
-    """Mock environment variables for testing."""
-    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{temp_db_path}")
-    monkeypatch.setenv("IMAGE_DIR", str(temp_image_dir))
-    monkeypatch.setenv("LOG_LEVEL", "INFO")
+def temp_image_dir(_temp_image_root: Path) -> Path:
+    """Create a temporary directory for test images."""
+    image_dir = _temp_image_root / uuid.uuid4().hex
+    image_dir.mkdir()
+    return image_dir
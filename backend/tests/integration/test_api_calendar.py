@@ -50,11 +50,14 @@ def test_add_calendar_source(test_client: TestClient):
         "ical_url": "https://calendar.google.com/calendar/ical/test/basic.ics",
     }
     response = test_client.post("/api/calendar/sources", json=source_data)
-    assert response.status_code == 200
-    data = response.json()
-    assert data["id"] == "test-calendar-1"
-    assert data["name"] == "Test Calendar"
-    assert data["type"] == "google"
+    try:
+        assert response.status_code == 200
+        data = response.json()
+        assert data["id"] == "test-calendar-1"
+        assert data["name"] == "Test Calendar"
+        assert data["type"] == "google"
+    finally:
+        test_client.delete("/api/calendar/sources/test-calendar-1")
 
 
 @pytest.mark.integration
@@ -0,0 +1,19 @@
+"""Integration tests for web services API endpoints."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.mark.integration
+def test_add_web_services_with_same_url_get_unique_ids(test_client: TestClient):
+    """Test that adding the same URL twice creates two distinct services."""
+    service = {"name": "Example", "url": "https://example.com"}
+    first = test_client.post("/api/web-services", json=service).json()
+    second = test_client.post("/api/web-services", json=service).json()
+
+    try:
+        assert first["id"] != second["id"]
+        assert first["id"].startswith("web-service-")
+    finally:
+        test_client.delete(f"/api/web-services/{first['id']}")
+        test_client.delete(f"/api/web-services/{second['id']}")
@@ -1,22 +1,37 @@
 """Unit tests for calendar service."""
 
+import asyncio
 from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
 from app.models.calendar import CalendarEvent, CalendarSource
-from app.services.calendar_service import calendar_service
+from app.services.calendar_service import CacheKey, calendar_service
+
+_RANGE_START = datetime(2024, 1, 1, tzinfo=UTC)
+_RANGE_END = _RANGE_START + timedelta(days=30)
+
+
+def cache_key(source_id: str) -> CacheKey:
+    """Build an event cache key for a source over a fixed date range."""
+    return (source_id, _RANGE_START, _RANGE_END)
+
+
+@pytest.fixture
+def mock_parse_ical():
+    """Patch the iCal feed parser with an AsyncMock that returns no events."""
+    with patch(
+        "app.services.calendar_service.parse_ical_from_url", new_callable=AsyncMock
+    ) as mock_parse:
+        mock_parse.return_value = []
+        yield mock_parse
 
 
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_get_events_no_sources():
     """Test getting events when no sources are configured."""
-    # Clear sources
-    calendar_service.sources = []
-    calendar_service._cache.clear()
-
     start_date = datetime.now(UTC)
     end_date = start_date + timedelta(days=30)
 
@@ -29,14 +44,8 @@ async def test_get_events_no_sources():
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_add_source():
+async def test_add_source(test_db):
     """Test adding a calendar source."""
-    # Clean up any existing source with this ID first
-    try:
-        await calendar_service.remove_source("test-calendar-1")
-    except Exception:
-        pass  # Ignore if it doesn't exist
-
     source = CalendarSource(
         id="test-calendar-1",
         type="google",
@@ -48,12 +57,12 @@ async def test_add_source():
     await calendar_service.add_source(source)
 
     assert len(calendar_service.sources) > 0
-    assert any(s.id == "test-calendar-1" for s in calendar_service.sources)
+    assert "test-calendar-1" in calendar_service._sources_by_id
 
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_remove_source():
+async def test_remove_source(test_db):
     """Test removing a calendar source."""
     source = CalendarSource(
         id="test-calendar-2",
@@ -64,25 +73,17 @@ async def test_remove_source():
     )
 
     await calendar_service.add_source(source)
-    assert any(s.id == "test-calendar-2" for s in calendar_service.sources)
+    assert "test-calendar-2" in calendar_service._sources_by_id
 
     await calendar_service.remove_source("test-calendar-2")
-    assert not any(s.id == "test-calendar-2" for s in calendar_service.sources)
+    assert "test-calendar-2" not in calendar_service._sources_by_id
 
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_get_events_with_mock_ical():
+async def test_get_events_with_mock_ical(test_db, mock_parse_ical):
     """Test getting events from a mock iCal source."""
-
-    # Clean up any existing source with this ID first
-    try:
-        await calendar_service.remove_source("test-calendar-3")
-    except Exception:
-        pass  # Ignore if it doesn't exist
-
-    # Mock the iCal parser
-    mock_events = [
+    mock_parse_ical.return_value = [
         CalendarEvent(
             id="event-1",
             title="Test Event",
@@ -93,36 +94,29 @@ async def test_get_events_with_mock_ical():
         )
     ]
 
-    with patch(
-        "app.services.calendar_service.parse_ical_from_url", new_callable=AsyncMock
-    ) as mock_parse:
-        mock_parse.return_value = mock_events
-
-        source = CalendarSource(
-            id="test-calendar-3",
-            type="google",
-            name="Test Calendar 3",
-            enabled=True,
-            ical_url="https://calendar.google.com/calendar/ical/test3/basic.ics",
-        )
+    source = CalendarSource(
+        id="test-calendar-3",
+        type="google",
+        name="Test Calendar 3",
+        enabled=True,
+        ical_url="https://calendar.google.com/calendar/ical/test3/basic.ics",
+    )
 
-        await calendar_service.add_source(source)
+    await calendar_service.add_source(source)
 
-        start_date = datetime.now(UTC)
-        end_date = start_date + timedelta(days=30)
+    start_date = datetime.now(UTC)
+    end_date = start_date + timedelta(days=30)
 
-        events = await calendar_service.get_events(start_date, end_date)
+    events = await calendar_service.get_events(start_date, end_date)
 
-        # Should include the mock event
-        assert any(e.id == "event-1" for e in events)
+    # Should include the mock event
+    assert any(e.id == "event-1" for e in events)
 
 
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_cache_behavior():
     """Test that events are cached and reused."""
-    calendar_service._cache.clear()
-
     start_date = datetime.now(UTC)
     end_date = start_date + timedelta(days=30)
 
@@ -143,10 +137,171 @@ async def test_cache_behavior():
 @pytest.mark.asyncio
 async def test_clear_cache():
     """Test clearing the event cache."""
-    calendar_service._cache["test_key"] = {"events": [], "timestamp": datetime.now()}
+    calendar_service._cache_events(cache_key("test-source"), [])
 
-    assert "test_key" in calendar_service._cache
+    assert cache_key("test-source") in calendar_service._cache
 
     calendar_service.clear_cache()
 
     assert len(calendar_service._cache) == 0
+
+
+@pytest.mark.unit
+def test_cache_is_bounded():
+    """Test that the event cache evicts the oldest entries beyond its size limit."""
+    max_entries = calendar_service._cache_max_entries
+
+    for i in range(max_entries + 10):
+        calendar_service._cache_events(cache_key(f"source-{i}"), [])
+
+    assert len(calendar_service._cache) == max_entries
+    assert cache_key("source-0") not in calendar_service._cache
+    assert cache_key(f"source-{max_entries + 9}") in calendar_service._cache
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used():
+    """Test that a cache hit protects an entry from eviction."""
+    source = CalendarSource(
+        id="test-calendar-lru",
+        type="google",
+        name="LRU Calendar",
+        enabled=True,
+        ical_url="https://calendar.google.com/calendar/ical/lru/basic.ics",
+    )
+    start_date = datetime.now(UTC)
+    end_date = start_date + timedelta(days=30)
+    hot_key = (source.id, start_date, end_date)
+
+    calendar_service._cache_events(hot_key, [])
+    for i in range(calendar_service._cache_max_entries - 1):
+        calendar_service._cache_events(cache_key(f"source-{i}"), [])
+
+    # Hit the oldest entry, then overflow the cache by one
+    await calendar_service._get_source_events(source, start_date, end_date)
+    calendar_service._cache_events(cache_key("overflow"), [])
+
+    assert hot_key in calendar_service._cache
+    assert cache_key("source-0") not in calendar_service._cache
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_concurrent_fetches_are_coalesced(mock_parse_ical):
+    """Test that concurrent requests for the same feed share one fetch."""
+    url = "https://calendar.google.com/calendar/ical/coalesce/basic.ics"
+
+    async def slow_parse(_url):
+        await asyncio.sleep(0.01)
+        return []
+
+    mock_parse_ical.side_effect = slow_parse
+    results = await asyncio.gather(
+        calendar_service._fetch_ical_events(url),
+        calendar_service._fetch_ical_events(url),
+    )
+
+    assert results == [[], []]
+    assert mock_parse_ical.call_count == 1
+    assert url not in calendar_service._inflight
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_sweep_cache_removes_expired_entries():
+    """Test that sweeping drops expired cache entries and keeps fresh ones."""
+    calendar_service._cache_events(cache_key("fresh"), [])
+    calendar_service._cache[cache_key("stale")] = (0.0, [])
+
+    assert await calendar_service.sweep_cache() == 1
+    assert cache_key("stale") not in calendar_service._cache
+    assert cache_key("fresh") in calendar_service._cache
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_refresh_cache_refetches_cached_ranges(mock_parse_ical):
+    """Test that refreshing re-fetches each cached range instead of dropping it."""
+    source = CalendarSource(
+        id="test-calendar-refresh",
+        type="google",
+        name="Refresh Calendar",
+        enabled=True,
+        ical_url="https://calendar.google.com/calendar/ical/refresh/basic.ics",
+    )
+    start_date = datetime.now(UTC)
+    end_date = start_date + timedelta(days=30)
+    fresh_event = CalendarEvent(
+        id="event-fresh",
+        title="Fresh Event",
+        start=start_date + timedelta(days=1),
+        end=start_date + timedelta(days=1, hours=1),
+        all_day=False,
+        source="feed",
+    )
+
+    calendar_service.sources = [source]
+    calendar_service._cache_events((source.id, start_date, end_date), [])
+    mock_parse_ical.return_value = [fresh_event]
+    refreshed = await calendar_service.refresh_cache()
+
+    assert refreshed == 1
+    _, cached_events = calendar_service._cache[(source.id, start_date, end_date)]
+    assert [e.id for e in cached_events] == ["event-fresh"]
+    assert cached_events[0].source == source.id
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_malformed_source_url_does_not_fail_other_sources(mock_parse_ical):
+    """Test that a source with an unparseable URL is skipped instead of failing the request."""
+    mock_parse_ical.return_value = [
+        CalendarEvent(
+            id="event-good",
+            title="Good Event",
+            start=datetime.now(UTC) + timedelta(days=1),
+            end=datetime.now(UTC) + timedelta(days=1, hours=1),
+            all_day=False,
+            source="feed",
+        )
+    ]
+    good = CalendarSource(
+        id="test-calendar-good",
+        type="google",
+        name="Good Calendar",
+        ical_url="https://calendar.google.com/calendar/ical/good/basic.ics",
+    )
+    bad = CalendarSource(
+        id="test-calendar-bad",
+        type="google",
+        name="Bad Calendar",
+        ical_url="https://[oops/calendar/u/0?cid=abc",
+    )
+    calendar_service.sources = [bad, good]
+    start_date = datetime.now(UTC)
+    end_date = start_date + timedelta(days=30)
+
+    events = await calendar_service.get_events(start_date, end_date)
+    assert good.id in {e.source for e in events}
+
+    # Both sources' ranges are cached now; refreshing them must not raise either
+    assert await calendar_service.refresh_cache() == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_refresh_cache_keeps_lru_order(mock_parse_ical):
+    """Test that a background refresh doesn't mark refreshed ranges as recently used."""
+    source = CalendarSource(
+        id="test-calendar-lru-refresh",
+        type="google",
+        name="LRU Refresh Calendar",
+        ical_url="https://calendar.google.com/calendar/ical/lru-refresh/basic.ics",
+    )
+    calendar_service.sources = [source]
+    calendar_service._cache_events(cache_key(source.id), [])
+    calendar_service._cache_events(cache_key("other-source"), [])
+
+    assert await calendar_service.refresh_cache() == 1
+    assert list(calendar_service._cache) == [cache_key(source.id), cache_key("other-source")]
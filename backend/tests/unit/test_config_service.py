@@ -1,58 +1,53 @@
 """Tests for config service."""
 
+from unittest.mock import patch
+
 import pytest
 
+from app.models.db_models import ConfigDB
 from app.services.config_service import ConfigService
 
 
+@pytest.fixture
+def service() -> ConfigService:
+    """Config service with its own, initially empty, cache."""
+    return ConfigService()
+
+
 @pytest.mark.asyncio
 @pytest.mark.unit
-async def test_get_value_nonexistent(test_db):
+async def test_get_value_nonexistent(test_db, service):
     """Test getting a non-existent config value."""
-    service = ConfigService()
     value = await service.get_value("nonexistent_key", default="default_value")
     assert value == "default_value"
 
 
 @pytest.mark.asyncio
 @pytest.mark.unit
-async def test_set_and_get_value(test_db):
-    """Test setting and getting a config value."""
-    service = ConfigService()
-
-    # Set a value
-    await service.set_value("test_key", "test_value")
-
-    # Get the value
-    value = await service.get_value("test_key")
-    assert value == "test_value"
+@pytest.mark.parametrize(
+    ("key", "value", "value_type"),
+    [
+        ("test_key", "test_value", None),
+        ("test_int", 42, "int"),
+        ("test_bool", True, "bool"),
+        ("test_json", {"a": [1, 2]}, None),
+    ],
+)
+async def test_set_and_get_value(test_db, service, key, value, value_type):
+    """Test that values round-trip with detected or explicit types."""
+    await service.set_value(key, value, value_type=value_type)
+
+    result = await service.get_value(key)
+    assert result == value
+    assert type(result) is type(value)
 
 
 @pytest.mark.asyncio
 @pytest.mark.unit
-async def test_set_and_get_value_with_type(test_db):
-    """Test setting and getting a config value with explicit type."""
-    service = ConfigService()
-
-    # Set an integer value
-    await service.set_value("test_int", 42, value_type="int")
-
-    # Get the value
-    value = await service.get_value("test_int")
-    assert value == 42
-    assert isinstance(value, int)
-
-
-@pytest.mark.asyncio
-@pytest.mark.unit
-async def test_get_config(test_db):
+async def test_get_config(test_db, service):
     """Test getting all config values."""
-    service = ConfigService()
-
-    # Set multiple values
-    await service.set_value("key1", "value1")
-    await service.set_value("key2", 123, value_type="int")
-    await service.set_value("key3", True, value_type="bool")
+    # Set multiple values in one transaction; types are detected from the values
+    await service.update_config({"key1": "value1", "key2": 123, "key3": True})
 
     # Get all config
     config = await service.get_config()
@@ -67,12 +62,10 @@ async def test_get_config(test_db):
 
 @pytest.mark.asyncio
 @pytest.mark.unit
-async def test_update_config(test_db):
+async def test_update_config(test_db, service):
     """Test updating config values."""
-    service = ConfigService()
-
     # Set initial value
-    await service.set_value("test_key", "initial_value")
+    await service.update_config({"test_key": "initial_value"})
 
     # Update config
     await service.update_config({"test_key": "updated_value", "new_key": "new_value"})
@@ -80,3 +73,91 @@ async def test_update_config(test_db):
     # Verify updates
     assert await service.get_value("test_key") == "updated_value"
     assert await service.get_value("new_key") == "new_value"
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_update_config_persists_and_updates_cache(test_db, service):
+    """Test that a batch update is written to the database and the cache."""
+    await service.get_config()  # Load the cache
+
+    await service.update_config({"batch_int": 3, "batch_bool": True})
+
+    assert (await service.get_config())["batch_int"] == 3
+    fresh = ConfigService()
+    assert await fresh.get_value("batch_int") == 3
+    assert await fresh.get_value("batch_bool") is True
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_get_config_cache_tracks_updates(test_db, service):
+    """Test that cached config reflects writes and is not exposed for mutation."""
+    await service.set_value("cached_key", "before")
+    config = await service.get_config()
+    assert config["cached_key"] == "before"
+
+    # Mutating the returned dict must not leak into the cache
+    config["cached_key"] = "mutated"
+    assert await service.get_value("cached_key") == "before"
+
+    # Writes update the cached snapshot
+    await service.set_value("cached_key", 7, value_type="string")
+    assert (await service.get_config())["cached_key"] == "7"
+    assert await service.get_value("cached_key") == "7"
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_set_defaults_only_fills_missing_keys(test_db, service):
+    """Test that defaults never overwrite existing values."""
+    await service.set_value("defaults_existing", "kept")
+
+    await service.set_defaults({"defaults_existing": "overwritten", "defaults_new": 5})
+
+    assert await service.get_value("defaults_existing") == "kept"
+    assert await service.get_value("defaults_new") == 5
+    # Values are persisted, not only cached
+    assert await ConfigService().get_value("defaults_new") == 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_set_defaults_fills_null_values(test_db, service):
+    """Test that defaults replace keys stored with a NULL value."""
+    test_db.add(ConfigDB(key="defaults_null", value=None, value_type="string"))
+    await test_db.commit()
+
+    await service.set_defaults({"defaults_null": 3})
+
+    assert await ConfigService().get_value("defaults_null") == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_load_overlapping_a_write_is_not_cached(test_db, service):
+    """Test that config loaded while a write commits is returned but not cached."""
+    await ConfigService().set_value("raced_key", "before")
+    parse_value = service._parse_value
+
+    def parse_during_write(value, value_type):
+        service._cache_generation += 1  # Another request's write lands mid-load
+        return parse_value(value, value_type)
+
+    with patch.object(service, "_parse_value", side_effect=parse_during_write):
+        config = await service.get_config()
+
+    assert config["raced_key"] == "before"
+    assert service._cache is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_set_defaults_caches_stored_values(test_db, service):
+    """Test that cached defaults are copies parsed from storage, not the caller's objects."""
+    default = {"items": [1, 2]}
+    await service.set_defaults({"defaults_json": default})
+
+    default["items"].append(3)
+
+    assert await service.get_value("defaults_json") == {"items": [1, 2]}
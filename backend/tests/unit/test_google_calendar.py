@@ -0,0 +1,71 @@
+"""Unit tests for Google Calendar URL helpers."""
+
+import pytest
+
+from app.utils.google_calendar import (
+    convert_share_url_to_ical,
+    is_google_calendar_url,
+    normalize_google_calendar_url,
+)
+
+
+@pytest.mark.unit
+def test_convert_share_url_to_ical():
+    """Test converting a share URL to an iCal feed URL."""
+    share_url = "https://calendar.google.com/calendar/u/0?cid=team@group.calendar.google.com"
+
+    assert convert_share_url_to_ical(share_url) == (
+        "https://calendar.google.com/calendar/ical/team%40group.calendar.google.com/basic.ics"
+    )
+
+
+@pytest.mark.unit
+def test_convert_share_url_without_cid():
+    """Test that a URL without a calendar ID cannot be converted."""
+    assert convert_share_url_to_ical("https://calendar.google.com/calendar/u/0") is None
+
+
+@pytest.mark.unit
+def test_normalize_keeps_ical_urls():
+    """Test that iCal URLs, including private ones, are returned unchanged."""
+    ical_url = "https://calendar.google.com/calendar/ical/abc/private-123/basic.ics"
+
+    assert normalize_google_calendar_url(ical_url) == ical_url
+
+
+@pytest.mark.unit
+def test_is_google_calendar_url_checks_hostname():
+    """Test that only URLs hosted on calendar.google.com are recognised."""
+    assert is_google_calendar_url("https://calendar.google.com/calendar/u/0?cid=abc")
+    assert not is_google_calendar_url("https://evil.example/?next=calendar.google.com")
+
+
+@pytest.mark.unit
+def test_normalize_converts_share_urls():
+    """Test that share URLs are converted and other URLs are left alone."""
+    share_url = "https://calendar.google.com/calendar/u/0?cid=abc"
+
+    assert normalize_google_calendar_url(share_url).endswith("/ical/abc/basic.ics")
+    assert normalize_google_calendar_url("https://example.com/?cid=abc") == (
+        "https://example.com/?cid=abc"
+    )
+
+
+@pytest.mark.unit
+def test_malformed_url_is_not_an_error():
+    """Test that URLs urlsplit rejects are treated as non-Google and left unchanged."""
+    malformed = "https://[oops/calendar/u/0?cid=abc"
+
+    assert not is_google_calendar_url(malformed)
+    assert normalize_google_calendar_url(malformed) == malformed
+
+
+@pytest.mark.unit
+def test_share_url_without_scheme_is_converted():
+    """Test that a share URL pasted without https:// is still recognised and converted."""
+    share_url = "calendar.google.com/calendar/u/0?cid=abc@group.calendar.google.com"
+
+    assert is_google_calendar_url(share_url)
+    assert normalize_google_calendar_url(share_url) == (
+        "https://calendar.google.com/calendar/ical/abc%40group.calendar.google.com/basic.ics"
+    )
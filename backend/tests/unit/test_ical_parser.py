@@ -0,0 +1,92 @@
+"""Unit tests for iCal parser."""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.utils import ical_parser
+from app.utils.ical_parser import parse_ical_from_file, parse_ical_from_url
+
+ICAL_FEED = b"""BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//Calvin//Test//EN
+BEGIN:VEVENT
+UID:event-1
+SUMMARY:Team Meeting
+DESCRIPTION:Weekly sync
+DTSTART:20240101T090000Z
+DTEND:20240101T100000Z
+END:VEVENT
+BEGIN:VEVENT
+UID:event-2
+SUMMARY:Holiday
+DTSTART;VALUE=DATE:20240102
+DTEND;VALUE=DATE:20240104
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def mock_client(handler):
+    """Patch httpx.AsyncClient in the parser to serve requests from handler."""
+    real_client = httpx.AsyncClient
+
+    def factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    return patch("app.utils.ical_parser.httpx.AsyncClient", side_effect=factory)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_parse_ical_from_url():
+    """Test fetching and parsing a feed."""
+    with mock_client(
+        lambda request: httpx.Response(
+            200, content=ICAL_FEED, headers={"content-type": "text/calendar"}
+        )
+    ):
+        events = await parse_ical_from_url("https://example.com/basic.ics")
+
+    assert [e.id for e in events] == ["event-1", "event-2"]
+    assert events[1].all_day
+    # DTEND of an all-day event is exclusive, so the event ends on Jan 3
+    assert events[1].end.day == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_parse_ical_from_url_rejects_oversized_feed():
+    """Test that a feed larger than the limit is rejected."""
+    with (
+        mock_client(lambda request: httpx.Response(200, content=ICAL_FEED)),
+        patch.object(ical_parser, "MAX_ICAL_BYTES", 16),
+        pytest.raises(ValueError),
+    ):
+        await parse_ical_from_url("https://example.com/basic.ics")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_parse_ical_from_url_http_error():
+    """Test that HTTP errors are raised to the caller."""
+    with (
+        mock_client(lambda request: httpx.Response(404, content=b"Not found")),
+        pytest.raises(httpx.HTTPStatusError),
+    ):
+        await parse_ical_from_url("https://example.com/basic.ics")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_parse_ical_from_file(tmp_path):
+    """Test parsing a feed from a local file."""
+    ics_path = tmp_path / "calendar.ics"
+    ics_path.write_bytes(ICAL_FEED)
+
+    events = await parse_ical_from_file(str(ics_path))
+
+    assert [e.title for e in events] == ["Team Meeting", "Holiday"]
+    assert events[0].description == "Weekly sync"
+    assert events[0].location is None
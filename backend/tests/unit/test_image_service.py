@@ -1,6 +1,9 @@
 """Unit tests for image service."""
 
+import io
+from functools import lru_cache
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from PIL import Image
@@ -8,27 +11,28 @@ from PIL import Image
 from app.services.image_service import ImageService
 
 
+@lru_cache
+def _jpeg_bytes(width: int, height: int) -> bytes:
+    """Encode a solid red JPEG once per size."""
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), color="red").save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
 def create_test_image(path: Path, width: int = 100, height: int = 100):
     """Create a valid test image file."""
-    img = Image.new("RGB", (width, height), color="red")
-    img.save(path, "JPEG")
+    path.write_bytes(_jpeg_bytes(width, height))
 
 
 @pytest.mark.unit
 def test_image_service_initialization(temp_image_dir: Path):
-    """Test initializing image service with a directory."""
+    """Test initializing image service with an empty directory."""
     service = ImageService(str(temp_image_dir))
     # image_dir is stored as Path, compare Path objects
     assert service.image_dir == Path(temp_image_dir)
-    assert len(service.get_images()) == 0
 
-
-@pytest.mark.unit
-def test_scan_images_empty_directory(temp_image_dir: Path):
-    """Test scanning an empty directory."""
-    service = ImageService(str(temp_image_dir))
+    # Scanning the empty directory finds nothing
     service.scan_images()
-
     assert len(service.get_images()) == 0
 
 
@@ -79,8 +83,8 @@ def test_get_current_image(temp_image_dir: Path):
 
 
 @pytest.mark.unit
-def test_next_image(temp_image_dir: Path):
-    """Test navigating to the next image."""
+def test_navigate_next_then_previous(temp_image_dir: Path):
+    """Test navigating to the next image and back to the previous one."""
     create_test_image(temp_image_dir / "test1.jpg")
     create_test_image(temp_image_dir / "test2.jpg")
 
@@ -90,24 +94,10 @@ def test_next_image(temp_image_dir: Path):
     first_image = service.get_current_image()
     service.next_image()
     second_image = service.get_current_image()
-
     assert first_image["id"] != second_image["id"]
 
-
-@pytest.mark.unit
-def test_previous_image(temp_image_dir: Path):
-    """Test navigating to the previous image."""
-    create_test_image(temp_image_dir / "test1.jpg")
-    create_test_image(temp_image_dir / "test2.jpg")
-
-    service = ImageService(str(temp_image_dir))
-    service.scan_images()
-
-    first_image = service.get_current_image()
-    service.next_image()
     service.previous_image()
     back_to_first = service.get_current_image()
-
     assert first_image["id"] == back_to_first["id"]
 
 
@@ -126,3 +116,39 @@ def test_get_image_by_id(temp_image_dir: Path):
     found_image = service.get_image_by_id(image_id)
     assert found_image is not None
     assert found_image["id"] == image_id
+
+
+@pytest.mark.unit
+def test_scan_images_generates_thumbnails(temp_image_dir: Path):
+    """Test that scanning generates a thumbnail for every image."""
+    for i in range(3):
+        create_test_image(temp_image_dir / f"test{i}.jpg")
+
+    service = ImageService(str(temp_image_dir))
+    images = service.scan_images()
+
+    assert len(images) == 3
+    assert all(service.get_thumbnail_path(img["id"]) is not None for img in images)
+
+
+@pytest.mark.unit
+def test_rescan_reuses_metadata_for_unchanged_files(temp_image_dir: Path):
+    """Test that rescanning only re-opens images that changed on disk."""
+    create_test_image(temp_image_dir / "test1.jpg")
+    create_test_image(temp_image_dir / "test2.jpg")
+
+    service = ImageService(str(temp_image_dir))
+    service.scan_images()
+
+    create_test_image(temp_image_dir / "test2.jpg", width=50, height=50)
+    create_test_image(temp_image_dir / "test3.jpg")
+    service._last_scan = None  # Force a rescan
+
+    with patch("app.services.image_service.Image.open", wraps=Image.open) as mock_open:
+        images = service.scan_images()
+
+    opened = {Path(call.args[0]).name for call in mock_open.call_args_list}
+    assert "test1.jpg" not in opened
+    assert {"test2.jpg", "test3.jpg"} <= opened
+    assert [img["filename"] for img in images] == ["test1.jpg", "test2.jpg", "test3.jpg"]
+    assert images[1]["width"] == 50
@@ -0,0 +1,63 @@
+"""Unit tests for keyboard input handling."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.utils import keyboard
+
+EV_KEY = 1
+
+
+def fake_input_device(keyboard_paths):
+    """Build an InputDevice stand-in where only keyboard_paths report EV_KEY."""
+
+    def factory(path):
+        device = MagicMock(path=path)
+        device.capabilities.return_value = {EV_KEY: []} if path in keyboard_paths else {}
+        return device
+
+    return MagicMock(side_effect=factory)
+
+
+@pytest.mark.unit
+def test_auto_detect_prefers_cached_device():
+    """Test that a previously detected keyboard is probed before other devices."""
+    input_device = fake_input_device({"/dev/input/event1", "/dev/input/event2"})
+    with (
+        patch.object(keyboard, "EVDEV_AVAILABLE", True),
+        patch.object(keyboard, "InputDevice", input_device),
+        patch.object(keyboard, "ecodes", SimpleNamespace(EV_KEY=EV_KEY)),
+        patch.object(keyboard, "_detected_device_path", "/dev/input/event2"),
+        patch.object(
+            keyboard,
+            "_keyboard_event_paths",
+            return_value=["/dev/input/event0", "/dev/input/event1", "/dev/input/event2"],
+        ),
+    ):
+        handler = keyboard.KeyboardHandler.__new__(keyboard.KeyboardHandler)
+        device = handler._auto_detect_keyboard()
+
+    assert device.path == "/dev/input/event2"
+    assert input_device.call_count == 1
+
+
+@pytest.mark.unit
+def test_keyboard_event_paths_reads_proc(tmp_path):
+    """Test that only devices with a keyboard handler are listed."""
+    proc_devices = tmp_path / "devices"
+    proc_devices.write_text(
+        "I: Bus=0019 Vendor=0000 Product=0001 Version=0000\n"
+        'N: Name="Power Button"\n'
+        "H: Handlers=event0\n"
+        "B: EV=3\n"
+        "\n"
+        "I: Bus=0003 Vendor=046d Product=c31c Version=0110\n"
+        'N: Name="USB Keyboard"\n'
+        "H: Handlers=sysrq kbd leds event3\n"
+        "B: EV=120013\n"
+    )
+
+    with patch.object(keyboard, "PROC_INPUT_DEVICES", proc_devices):
+        assert keyboard._keyboard_event_paths() == ["/dev/input/event3"]
@@ -0,0 +1,33 @@
+"""Tests for keyboard mapping service."""
+
+import pytest
+
+from app.services.keyboard_mapping_service import KeyboardMappingService
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_set_mappings_replaces_existing(test_db):
+    """Test that setting mappings replaces all mappings for that keyboard type."""
+    # The service's sessions join test_db's transaction, so nothing needs cleaning up
+    service = KeyboardMappingService()
+    await service.set_mappings("test-keyboard", {"KEY_1": "generic_next", "KEY_2": "none"})
+    await service.set_mappings("test-keyboard", {"KEY_3": "mode_photos"})
+
+    # A fresh instance reads from the database rather than the cache
+    stored = await KeyboardMappingService().get_mappings("test-keyboard")
+    assert stored == {"KEY_3": "mode_photos"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_set_all_mappings_writes_every_type(test_db):
+    """Test that mappings for several keyboard types are stored together."""
+    service = KeyboardMappingService()
+    await service.set_all_mappings(
+        {"test-keyboard-a": {"KEY_1": "generic_next"}, "test-keyboard-b": {"KEY_2": "none"}}
+    )
+
+    stored = await KeyboardMappingService().get_all_mappings()
+    assert stored["test-keyboard-a"] == {"KEY_1": "generic_next"}
+    assert stored["test-keyboard-b"] == {"KEY_2": "none"}
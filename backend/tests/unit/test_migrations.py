@@ -0,0 +1,139 @@
+"""Unit tests for database migrations."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.config import settings
+from app.utils.migrations import CURRENT_SCHEMA_VERSION, _migrate_database_sync
+
+
+def create_legacy_database(path: Path):
+    """Create a database with the original calendar_sources schema only."""
+    conn = sqlite3.connect(str(path))
+    conn.execute(
+        """
+        CREATE TABLE calendar_sources (
+            id TEXT PRIMARY KEY,
+            type TEXT NOT NULL,
+            name TEXT NOT NULL,
+            enabled BOOLEAN NOT NULL,
+            ical_url TEXT,
+            api_key TEXT
+        )
+        """
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.mark.unit
+def test_migrate_legacy_database(temp_db_path: Path, monkeypatch):
+    """Test that a legacy database is brought up to the current schema."""
+    create_legacy_database(temp_db_path)
+    monkeypatch.setattr(settings, "database_url", f"sqlite:///{temp_db_path}")
+
+    _migrate_database_sync()
+
+    conn = sqlite3.connect(str(temp_db_path))
+    try:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(calendar_sources)")}
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+    assert {"color", "show_time"} <= columns
+    assert {"web_services", "idx_web_services_order"} <= tables
+    assert journal_mode == "wal"
+    assert user_version == CURRENT_SCHEMA_VERSION
+
+
+@pytest.mark.unit
+def test_migrate_database_is_idempotent(temp_db_path: Path, monkeypatch):
+    """Test that running migrations twice leaves the schema unchanged."""
+    create_legacy_database(temp_db_path)
+    monkeypatch.setattr(settings, "database_url", f"sqlite:///{temp_db_path}")
+
+    _migrate_database_sync()
+    _migrate_database_sync()
+
+    conn = sqlite3.connect(str(temp_db_path))
+    try:
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(calendar_sources)")]
+    finally:
+        conn.close()
+
+    assert columns.count("color") == 1
+
+
+@pytest.mark.unit
+def test_migrate_skips_current_schema_version(temp_db_path: Path, monkeypatch):
+    """Test that a database already at the current schema version is left alone."""
+    create_legacy_database(temp_db_path)
+    conn = sqlite3.connect(str(temp_db_path))
+    conn.execute(f"PRAGMA user_version = {CURRENT_SCHEMA_VERSION}")
+    conn.close()
+    monkeypatch.setattr(settings, "database_url", f"sqlite:///{temp_db_path}")
+
+    _migrate_database_sync()
+
+    conn = sqlite3.connect(str(temp_db_path))
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    finally:
+        conn.close()
+
+    assert "web_services" not in tables
+
+
+@pytest.mark.unit
+def test_migrate_adds_keyboard_mappings_index(temp_db_path: Path, monkeypatch):
+    """Test that an existing keyboard_mappings table gets its lookup index."""
+    create_legacy_database(temp_db_path)
+    conn = sqlite3.connect(str(temp_db_path))
+    conn.execute(
+        """
+        CREATE TABLE keyboard_mappings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            keyboard_type TEXT NOT NULL,
+            key_code TEXT NOT NULL,
+            action TEXT NOT NULL
+        )
+        """
+    )
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(settings, "database_url", f"sqlite:///{temp_db_path}")
+
+    _migrate_database_sync()
+
+    conn = sqlite3.connect(str(temp_db_path))
+    try:
+        indexes = {
+            row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        }
+    finally:
+        conn.close()
+
+    assert "idx_keyboard_mappings_type" in indexes
+
+
+@pytest.mark.unit
+def test_migrate_leaves_empty_database_alone(temp_db_path: Path, monkeypatch):
+    """Test that an empty database file is left for init_db to populate."""
+    monkeypatch.setattr(settings, "database_url", f"sqlite:///{temp_db_path}")
+
+    _migrate_database_sync()
+
+    conn = sqlite3.connect(str(temp_db_path))
+    try:
+        user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+        tables = conn.execute("SELECT name FROM sqlite_master").fetchall()
+    finally:
+        conn.close()
+
+    assert user_version == 0
+    assert tables == []
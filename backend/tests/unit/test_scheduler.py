@@ -0,0 +1,39 @@
+"""Unit tests for calendar scheduler."""
+
+import inspect
+from datetime import timedelta
+
+import pytest
+
+from app.services.scheduler import CalendarScheduler
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_set_refresh_interval_reschedules_job():
+    """Test that changing the interval updates the existing refresh job."""
+    scheduler = CalendarScheduler()
+    scheduler.start()
+    try:
+        job = scheduler.scheduler.get_job("refresh_calendars")
+        assert job.trigger.interval == timedelta(minutes=15)
+
+        scheduler.set_refresh_interval(30)
+
+        job = scheduler.scheduler.get_job("refresh_calendars")
+        assert job.trigger.interval == timedelta(minutes=30)
+    finally:
+        scheduler.stop()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_sweep_job_runs_on_the_event_loop():
+    """Test that the cache sweep job is a coroutine, so it isn't run in a worker thread."""
+    scheduler = CalendarScheduler()
+    scheduler.start()
+    try:
+        job = scheduler.scheduler.get_job("sweep_calendar_cache")
+        assert inspect.iscoroutinefunction(job.func)
+    finally:
+        scheduler.stop()
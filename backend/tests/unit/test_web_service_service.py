@@ -0,0 +1,85 @@
+"""Tests for web service service."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.models.web_service import WebServiceCreate, WebServiceUpdate
+from app.services.web_service_service import WebServiceService
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_get_enabled_services_filters_and_orders(test_db):
+    """Test that only enabled services are returned, in display order."""
+    service = WebServiceService()
+    second = await service.add_service(
+        WebServiceCreate(name="Second", url="https://example.com/2", display_order=2),
+        session=test_db,
+    )
+    disabled = await service.add_service(
+        WebServiceCreate(name="Disabled", url="https://example.com/x", enabled=False),
+        session=test_db,
+    )
+    first = await service.add_service(
+        WebServiceCreate(name="First", url="https://example.com/1", display_order=1),
+        session=test_db,
+    )
+
+    enabled_ids = [s.id for s in await service.get_enabled_services(session=test_db)]
+    assert disabled.id not in enabled_ids
+    assert enabled_ids.index(first.id) < enabled_ids.index(second.id)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_service_list_cache_is_invalidated_on_writes(test_db):
+    """Test that the cached service list reflects adds, updates and removals."""
+    service = WebServiceService()
+    await service.get_services(session=test_db)  # Load the cache
+
+    created = await service.add_service(
+        WebServiceCreate(name="Cached", url="https://example.com/cached"), session=test_db
+    )
+    assert created.id in [s.id for s in await service.get_services(session=test_db)]
+
+    await service.update_service(created.id, WebServiceUpdate(name="Renamed"), session=test_db)
+    renamed = [s for s in await service.get_services(session=test_db) if s.id == created.id]
+    assert renamed[0].name == "Renamed"
+
+    await service.remove_service(created.id, session=test_db)
+    assert created.id not in [s.id for s in await service.get_services(session=test_db)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_update_and_remove_missing_service(test_db):
+    """Test that writes to an unknown service report it as not found."""
+    service = WebServiceService()
+
+    missing_update = await service.update_service(
+        "web-service-missing", WebServiceUpdate(name="x"), session=test_db
+    )
+    assert missing_update is None
+    assert await service.remove_service("web-service-missing", session=test_db) is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_read_overlapping_a_write_is_not_cached(test_db):
+    """Test that a list loaded while a write commits is returned but not cached."""
+    service = WebServiceService()
+    await service.add_service(
+        WebServiceCreate(name="Raced", url="https://example.com/raced"), session=test_db
+    )
+    to_web_service = service._to_web_service
+
+    def convert_during_write(db_service):
+        service._invalidate_cache()  # Another request's write lands mid-read
+        return to_web_service(db_service)
+
+    with patch.object(service, "_to_web_service", side_effect=convert_during_write):
+        services = await service.get_services(session=test_db)
+
+    assert services
+    assert service._cache is None